@@ -0,0 +1,62 @@
+import os
+import sys
+import time
+
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+import pygame
+from scripts.utils import load_images, Animation
+from scripts.particle import ParticleSystem
+
+PARTICLE_COUNT = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+RUNS = 20
+
+class CopiedAnimation:
+    # the old per-instance Animation, copied on every spawn
+    def __init__(self, images, fps, loop=True):
+        self.images = images
+        self.fps = fps
+        self.loop = loop
+        self.done = False
+        self.frame = 0
+
+    def copy(self):
+        return CopiedAnimation(self.images, self.fps, self.loop)
+
+class Game:
+    pass
+
+pygame.init()
+pygame.display.set_mode((1, 1))
+images = load_images("particles/particle", False)
+old_clip = CopiedAnimation(images, 12, loop=False)
+clip = Animation(images, 12, loop=False)
+game = Game()
+game.assets = {"particles/particle": clip}
+
+def copied():
+    return [old_clip.copy() for i in range(PARTICLE_COUNT)]
+
+def cursors():
+    return [clip.play() for i in range(PARTICLE_COUNT)]
+
+pool = cursors()
+def pooled():
+    for cursor in pool:
+        cursor.restart(clip)
+    return pool
+
+particles = ParticleSystem(game)
+def batched():
+    particles.clear()
+    for i in range(PARTICLE_COUNT):
+        particles.spawn("particle", (0, 0))
+    return particles
+
+for name, spawn in (("Animation.copy()", copied), ("clip.play() cursor", cursors), ("pooled cursor restart", pooled), ("ParticleSystem.spawn", batched)):
+    start = time.perf_counter()
+    for run in range(RUNS):
+        spawn()
+    elapsed = (time.perf_counter() - start) / RUNS * 1000
+    print(f"{name:24} {elapsed:7.3f} ms per {PARTICLE_COUNT} spawns")
@@ -0,0 +1,45 @@
+import os
+import sys
+import time
+import math
+import random
+
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+from main import Game
+from scripts.projectile import Projectile
+
+PROJECTILE_COUNT = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+FRAMES = 300
+FRAME_BUDGET = 1000 / 60
+
+random.seed(0)
+game = Game()
+game.load_level(0, "./data/dodging_maps/")
+bounds = game.tilemap.bounds
+
+def top_up(game):
+    while len(game.projectiles) < PROJECTILE_COUNT:
+        angle = random.random() * math.pi * 2
+        pos = [bounds.x + random.random() * bounds.width, bounds.y + random.random() * bounds.height]
+        game.projectiles.append(game.projectile_pools[Projectile].acquire(pos, 1.5, [math.cos(angle), math.sin(angle)]))
+
+render_scroll = (int(game.player.pos[0]) - 200, int(game.player.pos[1]) - 120)
+elapsed = 0
+expired = 0
+for frame in range(FRAMES):
+    top_up(game)
+    game.display.fill((0, 0, 0, 0))
+    game.life = 3
+    start = time.perf_counter()
+    expired += game.update_projectiles(damage=1)
+    game.render_projectiles(render_scroll)
+    elapsed += time.perf_counter() - start
+    game.sparks.clear()
+    game.particles.clear()
+
+frame_time = elapsed / FRAMES * 1000
+print(f"projectiles: {PROJECTILE_COUNT}, frames: {FRAMES}, expired or culled: {expired}")
+print(f"update, hit test and render: {frame_time:.3f} ms/frame ({'within' if frame_time <= FRAME_BUDGET else 'OVER'} the {FRAME_BUDGET:.1f} ms budget)")
+print(game.projectile_pools[Projectile].stats())
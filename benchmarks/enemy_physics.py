@@ -0,0 +1,33 @@
+import os
+import sys
+import time
+import random
+
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+from main import Game
+from scripts.entities import Enemy
+
+LEVEL = int(sys.argv[1]) if len(sys.argv) > 1 else 11
+ENEMY_COUNT = int(sys.argv[2]) if len(sys.argv) > 2 else 400
+FRAMES = 300
+
+random.seed(0)
+game = Game()
+game.load_level(LEVEL, "./data/maps/")
+
+spawns = [enemy.pos for enemy in game.enemies]
+game.enemies = []
+for i in range(ENEMY_COUNT):
+    pos = spawns[i % len(spawns)]
+    game.enemies.append(Enemy(game, (pos[0] + random.random() * 16 - 8, pos[1]), 1, (12,15)))
+
+start = time.perf_counter()
+for frame in range(FRAMES):
+    for enemy in game.enemies:
+        enemy.update(game.tilemap, shoot=False)
+elapsed = time.perf_counter() - start
+
+print(f"level: {LEVEL}, enemies: {len(game.enemies)}, frames: {FRAMES}")
+print(f"enemy update: {elapsed / FRAMES * 1000:.3f} ms/frame")
@@ -0,0 +1,28 @@
+import os
+import sys
+import time
+import tracemalloc
+
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+
+from scripts.tilemap import Tilemap
+
+MAP_ID = sys.argv[1] if len(sys.argv) > 1 else "11"
+RUNS = 200
+
+class Game:
+    pass
+
+tilemap = Tilemap(Game())
+for ext in (".json", ".map"):
+    path = "./data/maps/" + MAP_ID + ext
+    start = time.perf_counter()
+    for run in range(RUNS):
+        tilemap.load_map(path)
+    elapsed = (time.perf_counter() - start) / RUNS * 1000
+
+    tracemalloc.start()
+    tilemap.load_map(path)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{path}: {os.path.getsize(path)} bytes on disk, {elapsed:.3f} ms per load, {peak / 1024:.0f} KiB peak while loading, {current / 1024:.0f} KiB kept")
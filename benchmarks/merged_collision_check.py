@@ -0,0 +1,84 @@
+import os
+import sys
+import time
+import random
+
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+from main import Game
+from scripts.entities import Player
+
+MAPS_PATH = "./data/maps/"
+FRAMES = 1200
+SEED = 0
+
+def make_inputs(frames, seed):
+    rng = random.Random(seed)
+    inputs = []
+    movement = 0
+    for frame in range(frames):
+        if rng.random() < 0.03:
+            movement = rng.choice([-1, 0, 1])
+        inputs.append((movement, rng.random() < 0.04, rng.random() < 0.01))
+    return inputs
+
+def replay(game, level, inputs, merge_physics):
+    game.random.seed(SEED)
+    game.player = Player(game, (100,10), 2, (16,15))
+    game.levels.merge_physics = merge_physics
+    game.load_level(level, MAPS_PATH)
+
+    trace = []
+    elapsed = 0
+    for movement, jump, dash in inputs:
+        if jump:
+            game.player.jump()
+        if dash:
+            game.player.dash()
+
+        start = time.perf_counter()
+        for boss in game.bosses.copy():
+            if boss.update(game.tilemap):
+                game.bosses.remove(boss)
+        for enemy in game.enemies.copy():
+            if enemy.update(game.tilemap):
+                game.enemies.remove(enemy)
+        game.player.update(game.tilemap, (movement, 0))
+        elapsed += time.perf_counter() - start
+
+        for projectile in game.projectiles.copy():
+            if projectile.update():
+                game.projectiles.remove(projectile)
+        game.particles.clear()
+        game.sparks.clear()
+
+        trace.append([tuple(game.player.pos)] + [tuple(e.pos) for e in game.enemies + game.bosses])
+    return trace, elapsed
+
+inputs = make_inputs(FRAMES, SEED)
+game = Game()
+levels = [int(arg) for arg in sys.argv[1:]] or range(game.levels.level_count(MAPS_PATH))
+failed = False
+
+for level in levels:
+    tile_trace, tile_time = replay(game, level, inputs, False)
+    merged_trace, merged_time = replay(game, level, inputs, True)
+
+    mismatch = None
+    for frame in range(len(inputs)):
+        if tile_trace[frame] != merged_trace[frame]:
+            mismatch = frame
+            break
+
+    merged_rects = len({id(rect) for rect in game.tilemap.physics_rects.values()})
+    print(f"level {level}: {len(game.tilemap.physics_rects)} solid tiles merged into {merged_rects} rects")
+    if mismatch is None:
+        print(f"level {level}: match over {len(inputs)} frames, per-tile {tile_time * 1000 / len(inputs):.3f} ms/frame, merged {merged_time * 1000 / len(inputs):.3f} ms/frame")
+    else:
+        failed = True
+        print(f"level {level}: MISMATCH at frame {mismatch}")
+        print(f"  per-tile: {tile_trace[mismatch]}")
+        print(f"  merged:   {merged_trace[mismatch]}")
+
+sys.exit(1 if failed else 0)
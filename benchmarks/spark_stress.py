@@ -0,0 +1,50 @@
+import os
+import sys
+import time
+import math
+import random
+
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+
+import pygame
+from scripts.spark import SparkField
+
+SPARK_COUNT = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+FRAMES = 300
+FRAME_BUDGET = 1000 / 60
+
+pygame.init()
+display = pygame.Surface((400, 240), pygame.SRCALPHA)
+sparks = SparkField()
+random.seed(0)
+
+def top_up(sparks):
+    while len(sparks) < SPARK_COUNT:
+        sparks.spawn((random.random() * 400, random.random() * 240), random.random() * math.pi * 2, 2 + random.random())
+
+top_up(sparks)
+update_time = 0
+render_time = 0
+frame_times = []
+for frame in range(FRAMES):
+    display.fill((0, 0, 0, 0))
+    start = time.perf_counter()
+    sparks.update()
+    top_up(sparks)
+    update_end = time.perf_counter()
+    sparks.render(display)
+    render_end = time.perf_counter()
+
+    update_time += update_end - start
+    render_time += render_end - update_end
+    frame_times.append((render_end - start) * 1000)
+
+# the budget holds per frame, so the slow tail is what has to fit, not the average
+frame_times.sort()
+p99 = frame_times[min(FRAMES - 1, int(FRAMES * 0.99))]
+print(f"sparks: {SPARK_COUNT}, frames: {FRAMES}")
+print(f"update: {update_time / FRAMES * 1000:.3f} ms/frame")
+print(f"render: {render_time / FRAMES * 1000:.3f} ms/frame")
+print(f"total:  {sum(frame_times) / FRAMES:.3f} ms/frame, p99 {p99:.3f} ms, worst {frame_times[-1]:.3f} ms")
+print(f"p99 frame is {'within' if p99 <= FRAME_BUDGET else 'OVER'} the {FRAME_BUDGET:.1f} ms budget")
+sys.exit(0 if p99 <= FRAME_BUDGET else 1)
@@ -0,0 +1,51 @@
+import os
+import sys
+import json
+import time
+import tempfile
+import statistics
+import subprocess
+
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+RUNS = int(sys.argv[1]) if len(sys.argv) > 1 and sys.argv[1].isdigit() else 5
+CACHE_FILES = ["data/cache/game_assets.bin", "data/cache/outlines.json", "data/cache/outlines.png"]
+
+if "--child" in sys.argv:
+    start = time.perf_counter()
+    from main import Game
+    game = Game()
+    print(json.dumps(dict(game.asset_manager.timings, startup=time.perf_counter() - start)))
+    sys.exit(0)
+
+def startup(cold):
+    # a fresh interpreter per run so nothing stays warm in-process
+    if cold:
+        for path in CACHE_FILES:
+            if os.path.exists(path):
+                os.remove(path)
+    output = subprocess.run([sys.executable, "-m", "benchmarks.startup", "--child"], capture_output=True, text=True, check=True).stdout
+    return json.loads(output.splitlines()[-1])
+
+def report(label, runs):
+    median = {key: statistics.median(run[key] for run in runs) for key in runs[0]}
+    print(f"{label}: {median['startup'] * 1000:7.1f} ms to a ready Game, assets {median['hits']:.0f} from the pack / {median['misses']:.0f} decoded "
+          f"(pack {median['pack'] * 1000:.2f} ms, decode {median['decode'] * 1000:.2f} ms, convert {median['convert'] * 1000:.2f} ms, write {median['write'] * 1000:.2f} ms)")
+
+report("cold", [startup(True) for run in range(RUNS)])
+report("warm", [startup(False) for run in range(RUNS)])
+
+import pygame
+from scripts.assets import AssetManager, load_manifest
+
+pygame.init()
+pygame.display.set_mode((1, 1))
+for workers in sorted({1, os.cpu_count() or 1}):
+    times = []
+    for run in range(RUNS):
+        with tempfile.TemporaryDirectory() as path:
+            manager = AssetManager("game_assets", load_manifest("game"), path=path + "/", workers=workers)
+            manager.load()
+            times.append(manager.timings["decode"])
+    print(f"decode with {workers} worker(s): {statistics.median(times) * 1000:.2f} ms")
@@ -0,0 +1,66 @@
+import sys
+import time
+import json
+import pygame
+from scripts.tilemap import Tilemap, PHYSICS_TILES
+
+MAP_PATH = sys.argv[1] if len(sys.argv) > 1 else "./data/maps/11.json"
+FRAMES = 600
+ENTITY_SIZE = (12, 15)
+
+OLD_NEIGHBOUR_OFFSETS = [
+    (-1, 0), (-1, -1), (0, -1), (1, -1), (1, 0), (0, 0), (-1, 1), (0, 1), (1, 1), 
+    (-2, 0), (-2, -2), (0, -2), (2, -2), (2, 0), (0, 0), (-2, 2), (0, 2), (2, 2), 
+    (-2, 1), (-2, -2), (1, -2), (2, -2), (2, 1), (1, 1), (-2, 2), (1, 2), (2, 2), 
+    ]
+
+class String_tilemap:
+    def __init__(self, path, tile_size=16):
+        f = open(path, "r")
+        self.tilemap = json.load(f)["tilemap"]
+        f.close()
+        self.tile_size = tile_size
+
+    def physics_rects_around(self, rect):
+        rects = []
+        tile_loc = (int(rect.x // self.tile_size), int(rect.y // self.tile_size))
+        for offset in OLD_NEIGHBOUR_OFFSETS:
+            check_loc = str(tile_loc[0] + offset[0]) + ";" + str(tile_loc[1] + offset[1])
+            if check_loc in self.tilemap:
+                tile = self.tilemap[check_loc]
+                if tile["type"] in PHYSICS_TILES:
+                    rects.append(pygame.Rect(tile["pos"][0] * self.tile_size, tile["pos"][1] * self.tile_size, self.tile_size, self.tile_size))
+        return rects
+
+    def solid_check(self, pos):
+        tile_loc = str(int(pos[0] // self.tile_size)) + ";" + str(int(pos[1] // self.tile_size))
+        if tile_loc in self.tilemap:
+            if self.tilemap[tile_loc]["type"] in PHYSICS_TILES:
+                return self.tilemap[tile_loc]
+
+def entity_positions(tilemap):
+    positions = []
+    for spawner in tilemap.extract([("spawners", 0), ("spawners", 1), ("spawners", 2)], keep=True):
+        positions.append(spawner["pos"])
+    return positions
+
+def run_frames(tilemap, positions):
+    start = time.perf_counter()
+    for frame in range(FRAMES):
+        for pos in positions:
+            tilemap.physics_rects_around(pygame.Rect(pos, ENTITY_SIZE))
+            tilemap.physics_rects_around(pygame.Rect(pos[0], pos[1] + 1, ENTITY_SIZE[0], ENTITY_SIZE[1]))
+            tilemap.solid_check((pos[0] + 7, pos[1] + 23))
+    return (time.perf_counter() - start) / FRAMES
+
+tilemap = Tilemap(None, tile_size=16)
+tilemap.load_map(MAP_PATH)
+positions = entity_positions(tilemap)
+
+before = run_frames(String_tilemap(MAP_PATH), positions)
+after = run_frames(tilemap, positions)
+
+print(f"map: {MAP_PATH}, entities: {len(positions)}, frames: {FRAMES}")
+print(f"string keys, 27 offsets: {before * 1000:.4f} ms/frame")
+print(f"tuple keys, rect cache: {after * 1000:.4f} ms/frame")
+print(f"speedup: {before / after:.2f}x")
@@ -0,0 +1,26 @@
+import os
+import sys
+import glob
+import json
+
+from scripts.tilemap import loc_from_key
+from scripts.mapformat import encode_map, decode_map, source_stamp
+
+MAP_DIRS = ["data/maps", "data/dodging_maps"]
+
+paths = sys.argv[1:] or sorted(path for map_dir in MAP_DIRS for path in glob.glob(map_dir + "/*.json"))
+for path in paths:
+    with open(path, "r") as f:
+        map_data = json.load(f)
+    tilemap = {loc_from_key(key): tile for key, tile in map_data["tilemap"].items()}
+    data = encode_map(tilemap, map_data["tile_size"], map_data["offgrid"], source_stamp(path))
+
+    # refuse to write a map that would not load back exactly
+    if decode_map(data) != (tilemap, map_data["tile_size"], map_data["offgrid"]):
+        print(f"{path}: round trip mismatch, skipped")
+        continue
+
+    out_path = os.path.splitext(path)[0] + ".map"
+    with open(out_path, "wb") as f:
+        f.write(data)
+    print(f"{path}: {os.path.getsize(path)} -> {len(data)} bytes ({out_path})")
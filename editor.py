@@ -1,7 +1,8 @@
 import pygame
 import sys
 from pygame.locals import *
-from scripts.utils import load_image, load_images, current_fps
+from scripts.utils import current_fps
+from scripts.assets import AssetManager, load_manifest
 from scripts.tilemap import Tilemap
 
 class Editor:
@@ -16,13 +17,7 @@ class Editor:
         self.game_font = pygame.font.Font(None, 30)
         pygame.mouse.set_visible(False)
 
-        self.assets = {
-            'decor': load_images("tiles/decor", True),
-            'large_decor': load_images("tiles/large_decor", True),
-            'grass': load_images("tiles/grass", True),
-            'stone': load_images("tiles/stone", True),
-            'spawners': load_images("tiles/spawners", True)
-        }
+        self.assets = AssetManager("editor_assets", load_manifest("editor")).build()
 
         self.movement = [False, False, False, False]
         self.scroll = [0, 0]
@@ -69,16 +64,11 @@ class Editor:
                 self.display.blit(current_tile_img, (mouse_pos[0] - (current_tile_img.get_width() / 2), mouse_pos[1] - (current_tile_img.get_height() / 2)))
 
             if self.clicking and self.ongrid:
-                self.tilemap.tilemap[str(tile_pos[0]) + ";" + str(tile_pos[1])] = {"type": self.tile_list[self.tile_group], "variant": self.tile_variant, "pos": tile_pos}
+                self.tilemap.place_tile(tile_pos, self.tile_list[self.tile_group], self.tile_variant)
             if self.right_clicking:
-                tile_loc = str(tile_pos[0]) + ";" + str(tile_pos[1])
-                if tile_loc in self.tilemap.tilemap:
-                    del self.tilemap.tilemap[tile_loc]
-                for tile in self.tilemap.offgrid_tiles.copy():
-                    tile_img = self.assets[tile["type"]][tile["variant"]]
-                    tile_r = pygame.Rect(tile["pos"][0] - self.scroll[0], tile["pos"][1] - self.scroll[1], tile_img.get_width(), tile_img.get_height())
-                    if tile_r.collidepoint(mouse_pos):
-                        self.tilemap.offgrid_tiles.remove(tile)
+                self.tilemap.remove_tile(tile_pos)
+                for tile in self.tilemap.offgrid_tiles_in(pygame.Rect(mouse_pos[0] + self.scroll[0], mouse_pos[1] + self.scroll[1], 1, 1)):
+                    self.tilemap.remove_offgrid(tile)
 
             for event in pygame.event.get():
                 if event.type == QUIT:
@@ -89,7 +79,7 @@ class Editor:
                         self.clicking = True
 
                         if not self.ongrid:
-                            self.tilemap.offgrid_tiles.append({"type": self.tile_list[self.tile_group], "variant": self.tile_variant, "pos": (mouse_pos[0] - (current_tile_img.get_width() / 2) + self.scroll[0], mouse_pos[1] - (current_tile_img.get_height() / 2) + self.scroll[1])})
+                            self.tilemap.place_offgrid((mouse_pos[0] - (current_tile_img.get_width() / 2) + self.scroll[0], mouse_pos[1] - (current_tile_img.get_height() / 2) + self.scroll[1]), self.tile_list[self.tile_group], self.tile_variant)
                     if event.button == 3:
                         self.right_clicking = True
                     if event.button == 4:
@@ -0,0 +1,66 @@
+import os
+import sys
+import time
+import argparse
+
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+from main import Game
+from scripts.inputs import ScriptedInput, RandomInput, ReplayInput, InputRecorder, MODE_LEVEL, MODE_DODGE
+
+parser = argparse.ArgumentParser(description="Run a level without a window and time each subsystem.")
+parser.add_argument("map", type=int, nargs="?", default=0, help="map id in data/maps/")
+parser.add_argument("--dodge", action="store_true", help="play dodge mode instead of a level")
+parser.add_argument("--frames", type=int, default=None, help="defaults to 600, or the length of a replay")
+parser.add_argument("--script", help="JSON list of [step, \"down\" or \"up\", key name]")
+parser.add_argument("--replay", help="input recording from main.py --record or --record here")
+parser.add_argument("--record", help="record this run's input")
+parser.add_argument("--seed", type=int, default=0, help="game seed, also seeds the random input stream")
+parser.add_argument("--no-render", action="store_true", help="simulate only")
+parser.add_argument("--trace", help="write per-frame phase timings to a .csv or .json file")
+args = parser.parse_args()
+
+mode, map_id, seed, frames = MODE_DODGE if args.dodge else MODE_LEVEL, args.map, args.seed, args.frames or 600
+if args.replay:
+    source = ReplayInput(args.replay)
+    mode, map_id, seed, frames = source.mode, source.map_id, source.seed, args.frames or source.length()
+elif args.script:
+    source = ScriptedInput.load(args.script)
+else:
+    source = RandomInput(args.seed)
+
+game = Game(rendering=not args.no_render, realtime=False, seed=seed)
+game.input_source = source
+game.recorder = InputRecorder(args.record) if args.record else None
+game.frame_limit = frames
+if args.replay:
+    game.settings["3"] = source.details
+game.save_path = None
+game.profiler.enabled = True
+game.profiler.trace = [] if args.trace else None
+game.profiler.reset()
+
+start = time.perf_counter()
+if mode == MODE_DODGE:
+    game.dodge_mode()
+else:
+    game.run(map_id)
+elapsed = time.perf_counter() - start
+if game.recorder:
+    game.recorder.close()
+if args.trace:
+    game.profiler.export(args.trace)
+
+report = game.profiler.report()
+print(f"{'dodge map' if mode == MODE_DODGE else 'map'} {map_id}: {game.frames} frames in {elapsed:.2f}s ({game.frames / elapsed:.0f} frames/s)")
+print(f"player at ({game.player.pos[0]:.2f}, {game.player.pos[1]:.2f}), life {game.life}, {len(game.enemies)} enemies left")
+for phase in ("update", "render"):
+    print(f"{phase}:")
+    for name, ms in report.items():
+        if name.startswith(phase + ":"):
+            print(f"  {name[len(phase) + 1:]:12} {ms:7.3f} ms/frame, p95 {game.profiler.percentile(name, 95):7.3f}")
+for name in ("events", "overlay", "flip", "wait"):
+    if name in report:
+        print(f"{name:14} {report[name]:7.3f} ms/frame, p95 {game.profiler.percentile(name, 95):7.3f}")
+sys.exit(0)
@@ -1,19 +1,32 @@
 import pygame
 import sys
+import argparse
 import random
 import math
-import os
 from pygame.locals import *
 from scripts.entities import PhysicsEntity, Player, Enemy, Boss
-from scripts.utils import load_image, current_fps, load_images, Animation, load_sound, Fast_Rect, Text, saving, loading_save, Level_selector, Popup
+from scripts.utils import current_fps, image_paths, make_rotations, ROTATION_STEPS, load_sound, Fast_Rect, Text, saving, loading_save, Level_selector, Popup
 from scripts.tilemap import Tilemap
+from scripts.levels import LevelLoader
+from scripts.assets import AssetManager, load_manifest
 from scripts.clouds import Clouds
-from scripts.particle import Particle
-from scripts.spark import Spark
-
+from scripts.particle import ParticleSystem
+from scripts.spark import SparkField
+from scripts.broadphase import Broadphase
+from scripts.projectile import Projectile, Boss_projectile
+from scripts.pool import Pool
+from scripts.outline import Outline
+from scripts.render_target import RenderTargets
+from scripts.transitions import Transition
+from scripts.profiler import Profiler
+from scripts.inputs import InputRecorder, MODE_LEVEL, MODE_DODGE
+
+SIM_RATE = 60
+STEP_MS = 1000 / SIM_RATE
+MAX_STEPS = 5
 
 class Game:
-    def __init__(self):
+    def __init__(self, rendering=True, realtime=True, seed=None):
         pygame.mixer.pre_init(44100, -16, 2, 512)
         pygame.init()
         pygame.mixer.set_num_channels(64)
@@ -21,6 +34,9 @@ class Game:
         self.screen = pygame.display.set_mode((1280, 720), RESIZABLE | FULLSCREEN)
         self.display = pygame.Surface((400, 240), SRCALPHA)
         self.nonoutline_display = pygame.Surface((400, 240))
+        self.outline = Outline(self.display.get_size())
+        self.render_targets = RenderTargets(self.screen)
+        self.transition_effect = Transition(self.display.get_size())
         self.mainClock = pygame.time.Clock()
         self.game_font = pygame.font.Font(None, 25)
         self.big_game_font = pygame.font.Font(None, 40)
@@ -29,32 +45,29 @@ class Game:
         self.movement = [False, False]
         self.pickup = False
 
-        self.assets = {
-            'decor': load_images("tiles/decor", True),
-            'large_decor': load_images("tiles/large_decor", True),
-            'grass': load_images("tiles/grass", False),
-            'stone': load_images("tiles/stone", True),
-            'spawners': load_images("tiles/spawners", True),
-            'background': load_image("background.png", "y"),
-            'cloud': load_images("clouds", True),
-            'player/idle': Animation(load_images("entities/player/idle", True, True), fps=18),
-            'player/run': Animation(load_images("entities/player/run", True, True), fps=7),
-            'player/jump': Animation(load_images("entities/player/jump", True, True), fps=4),
-            'player/wall_slide': Animation(load_images("entities/player/wall_slide", True, True), fps=4),
-            'enemy/idle': Animation(load_images("entities/enemy/idle", True, True), fps=24),
-            'enemy/run': Animation(load_images("entities/enemy/run", True, True), fps=7),
-            'boss/idle': Animation(load_images("entities/boss/idle", True, True), fps=7),
-            'boss/run': Animation(load_images("entities/boss/run", True, True), fps=7),
-            'boss/attack': Animation(load_images("entities/boss/attack", True, True), fps=7),
-            'particles/leaf': Animation(load_images("particles/leaf", False), fps=20, loop=False),
-            'particles/particle': Animation(load_images("particles/particle", False), fps=12, loop=False),
-            'shiruken': load_image("shiruken.png", "y"),
-            'fireball': load_images("fireball", True),
-            'life': pygame.Surface((20, 10)),
-            'title': load_image("title.png", "y"),
-            'settings': load_image("buttons/setting.png", "y"),
-            'close': load_image("buttons/close.png", "y"),
-        }
+        # gameplay draws from self.random so a seed reproduces a session; screen shake has its own stream
+        self.seed = seed
+        self.random = random.Random(seed)
+        self.fx_random = random.Random()
+
+        self.asset_manager = AssetManager("game_assets", load_manifest("game"))
+        self.assets = self.asset_manager.build()
+        self.assets["life"] = pygame.Surface((20, 10))
+
+        self.assets["shiruken/flipped"] = pygame.transform.flip(self.assets["shiruken"], True, False)
+        self.assets["shiruken/rotations"] = make_rotations(self.assets["shiruken"])
+        self.assets["fireball/rotations"] = [make_rotations(img) for img in self.assets["fireball"]]
+
+        outlined = []
+        animations = ("player/idle", "player/run", "player/jump", "player/wall_slide", "enemy/idle", "enemy/run", "boss/idle", "boss/run", "boss/attack")
+        for name in animations:
+            outlined += self.assets[name].images + self.assets[name].flipped
+        outlined += [self.assets["shiruken"], self.assets["shiruken/flipped"]] + self.assets["shiruken/rotations"]
+        for rotations in self.assets["fireball/rotations"]:
+            outlined += rotations
+        # everything that shapes the list besides the PNGs themselves, so the atlas cache never hashes pixels
+        derivation = {"order": list(animations) + ["shiruken", "shiruken/flipped", "shiruken/rotations", "fireball/rotations"], "rotation_steps": ROTATION_STEPS, "manifest": {name: self.asset_manager.manifest[name] for name in animations + ("shiruken", "fireball")}}
+        self.outline.preload("outlines", outlined, image_paths("entities", "shiruken.png", "fireball"), derivation)
 
         self.sfx = {
             'jump': load_sound("./data/sfx/jump.wav", 0.3),
@@ -75,8 +88,10 @@ class Game:
             "3": True,
         }
 
+        # None keeps scores out of the player's save, for headless and replay runs
+        self.save_path = "./data/save.json"
         try:
-            self.data = loading_save("./data/save.json")
+            self.data = loading_save(self.save_path)
             self.settings = loading_save("./data/settings.json")
         except FileNotFoundError:
             pass
@@ -85,41 +100,144 @@ class Game:
         
 
         self.tilemap = Tilemap(self, tile_size=16)
+        self.levels = LevelLoader(self, tile_size=16)
         self.level = 0
 
+        self.projectiles = []
+        self.projectile_pools = {
+            Projectile: Pool(self, Projectile),
+            Boss_projectile: Pool(self, Boss_projectile),
+        }
+
 
-        self.clouds = Clouds(self.assets["cloud"], 12)
+        self.clouds = Clouds(self.assets["cloud"], 12, rng=self.random)
         self.screen_shake = 0
 
         self.paused = False
+
+        self.rendering = rendering
+        self.realtime = realtime
+        self.max_fps = 60
+        self.accumulator = 0
+
+        self.profiler = Profiler()
+        self.input_source = None
+        self.recorder = None
+        self.frame_limit = None
+        self.frames = 0
+        self.steps = 0
     
     def load_level(self, map_id, path=None):
         self.assets["life"].fill("red")
-        self.tilemap.load_map(str(path) + str(map_id) + ".json")
-
-        self.leaf_spawners = []
-        for tree in self.tilemap.extract([("large_decor", 1), ("large_decor", 4)], keep=True):
-            self.leaf_spawners.append(pygame.Rect(4 + tree["pos"][0], 4 + tree["pos"][1], 23, 13))
+        level = self.levels.load(path, map_id)
+        self.tilemap = level.tilemap
+        self.leaf_spawners = [pygame.Rect(rect) for rect in level.leaf_spawners]
 
         self.enemies = []
         self.bosses = []
-        for spawner in self.tilemap.extract([("spawners", 0), ("spawners", 1), ("spawners", 2)]):
-            if spawner["variant"] == 0:
-                self.player.pos = spawner["pos"]
+        for variant, pos in level.spawners:
+            if variant == 0:
+                self.player.pos = list(pos)
+                self.player.last_pos = tuple(self.player.pos)
                 self.player.air_time = 0
-            elif spawner["variant"] == 1:
-                self.enemies.append(Enemy(self, spawner["pos"], 1, (12,15)))
+            elif variant == 1:
+                self.enemies.append(Enemy(self, pos, 1, (12,15)))
             else:
-                self.bosses.append(Boss(self, spawner["pos"], 2, (15,30)))
+                self.bosses.append(Boss(self, pos, 2, (15,30)))
 
-        self.particles = []
+        self.particles = ParticleSystem(self)
+        for projectile in self.projectiles:
+            self.projectile_pools[type(projectile)].release(projectile)
         self.projectiles = []
-        self.sparks = []
+        self.projectile_grid = Broadphase()
+        self.sparks = SparkField()
         self.life = 3
 
         self.scroll = [0, 0]
+        self.last_scroll = (0, 0)
         self.transition = -30
 
+    def update_projectiles(self, damage=None):
+        survivors = []
+        for projectile in self.projectiles:
+            kill = projectile.update()
+
+            if kill:
+                self.projectile_grid.remove(projectile)
+                self.projectile_pools[type(projectile)].release(projectile)
+            else:
+                self.projectile_grid.move_point(projectile, projectile.pos)
+                survivors.append(projectile)
+        expired = len(self.projectiles) - len(survivors)
+        self.projectiles = survivors
+
+        if abs(self.player.dashing) < 50:
+            player_rect = self.player.rect()
+            for projectile in self.projectile_grid.query(player_rect):
+                if player_rect.collidepoint(projectile.pos):
+                    for i in range(30):
+                        angle = self.random.random() * math.pi * 2
+                        speed = self.random.random() * 5
+                        self.sparks.spawn(player_rect.center, angle, 2 + self.random.random())
+                        self.particles.spawn("particle", player_rect.center, [math.cos(angle + math.pi) * speed * 0.5, math.sin(angle + math.pi) * speed * 0.5], self.random.randint(0, 7))
+
+                    self.life -= projectile.damage if damage is None else damage
+                    self.projectiles.remove(projectile)
+                    self.projectile_grid.remove(projectile)
+                    self.projectile_pools[type(projectile)].release(projectile)
+                    self.screen_shake = max(16, self.screen_shake)
+                    self.sfx["hit"].play()
+
+        return expired
+
+    def render_projectiles(self, render_scroll, alpha=1, outline=None):
+        lag = 1 - alpha
+        for projectile in self.projectiles:
+            step = projectile.speed * lag
+            projectile.render(self.display, offset=(render_scroll[0] + projectile.velocity[0] * step, render_scroll[1] + projectile.velocity[1] * step), details=self.settings["3"], outline=outline)
+
+    def interpolated_scroll(self, alpha=1):
+        return (int(self.last_scroll[0] + (self.scroll[0] - self.last_scroll[0]) * alpha), int(self.last_scroll[1] + (self.scroll[1] - self.last_scroll[1]) * alpha))
+
+    def interpolated_offset(self, entity, render_scroll, alpha=1):
+        # shifting the offset draws the entity between its last and current step
+        return (render_scroll[0] + (entity.pos[0] - entity.last_pos[0]) * (1 - alpha), render_scroll[1] + (entity.pos[1] - entity.last_pos[1]) * (1 - alpha))
+
+    def end_frame(self):
+        if self.rendering:
+            current_fps(self.mainClock, self.game_font, self.screen, "black", self.settings["1"])
+            self.profiler.render(self.screen)
+            self.profiler.lap("overlay")
+            pygame.display.update()
+            self.profiler.lap("flip")
+        if self.realtime:
+            self.accumulator += min(self.mainClock.tick(self.max_fps), MAX_STEPS * STEP_MS)
+        else:
+            self.accumulator += STEP_MS
+        # the frame limiter's sleep, kept apart so it doesn't read as a cost
+        self.profiler.lap("wait")
+        self.profiler.end_frame()
+        self.frames += 1
+
+    def begin_session(self, mode, map_id):
+        seed = self.seed if self.seed is not None else self.random.randrange(1 << 31)
+        self.random.seed(seed)
+        self.frames = 0
+        self.steps = 0
+        if self.recorder:
+            self.recorder.begin(mode, map_id, seed, self.settings["3"])
+
+    def running(self):
+        return self.frame_limit is None or self.frames < self.frame_limit
+
+    def poll_events(self):
+        if self.input_source:
+            self.input_source.feed(self.steps)
+        events = pygame.event.get()
+        if self.recorder:
+            self.recorder.record(self.steps, events)
+        return events
+
     def pause_game(self):
         main_menu_button = Fast_Rect((140, 180), (120, 40), self.game_font, text="Main menu", image=None)
         pause_text = Text((145, 40), self.big_game_font, "Paused", "black")
@@ -151,119 +269,133 @@ class Game:
             pause_text.render(self.display)
             
             self.nonoutline_display.blit(self.display, (0,0))
-            self.screen.blit(pygame.transform.scale(self.nonoutline_display, self.screen.get_size()), (0,0))
+            self.render_targets.present(self.nonoutline_display)
             pygame.display.update()
+
+        # time spent paused is not game time, so resume without catching up on it
+        self.mainClock.tick()
+        self.accumulator = 0
         
     def run(self, level):
         # MARK: Main game
         MAPS_PATH = "./data/maps/"
+        self.begin_session(MODE_LEVEL, level)
         self.load_level(level, MAPS_PATH)
         self.level = level
+        self.levels.preload(MAPS_PATH, min(self.level + 1, self.levels.level_count(MAPS_PATH) - 1))
+
+        self.accumulator = STEP_MS
+        while self.running():
+            steps = 0
+            while self.accumulator >= STEP_MS and steps < MAX_STEPS:
+                self.accumulator -= STEP_MS
+                steps += 1
+                self.steps += 1
+                self.last_scroll = tuple(self.scroll)
+
+                self.screen_shake = max(0, self.screen_shake - 1)
+
+                if not len(self.enemies) and not len(self.bosses):
+                    self.transition += 1
+                    if self.transition > 30:
+                        self.level = min(self.level + 1, self.levels.level_count(MAPS_PATH) - 1)
+                        self.load_level(self.level, MAPS_PATH)
+                        self.levels.preload(MAPS_PATH, min(self.level + 1, self.levels.level_count(MAPS_PATH) - 1))
+                if self.transition < 0:
+                    self.transition += 1
+                
+                if self.life <= 0:
+                    self.player.velocity[0] = 0
+                    self.player.velocity[1] = 0
+                    self.life -= 1
+                    if self.life <= 10:
+                        self.transition = min(30, self.transition + 1)
 
-        while True:
-            self.display.fill((0, 0, 0, 0))
-            self.nonoutline_display.blit(pygame.transform.scale(self.assets["background"], self.display.get_size()), (0,0))
-
-            self.screen_shake = max(0, self.screen_shake - 1)
+                for rect in self.leaf_spawners:
+                    if self.random.random() * 49999 < rect.width * rect.height:
+                        pos = (rect.x + self.random.random() * rect.width, rect.y + self.random.random() * rect.height)
+                        self.particles.spawn("leaf", pos, velocity=[-0.1, 0.3], frame=self.random.randint(0, 20))
 
-            if not len(self.enemies) and not len(self.bosses):
-                self.transition += 1
-                if self.transition > 30:
-                    self.level = min(self.level + 1, len(os.listdir("./data/maps")) - 1)
-                    self.load_level(self.level, MAPS_PATH)
-            if self.transition < 0:
-                self.transition += 1
-            
-            if self.life <= 0:
-                self.player.velocity[0] = 0
-                self.player.velocity[1] = 0
-                self.life -= 1
-                if self.life <= 10:
-                    self.transition = min(30, self.transition + 1)
-
-            for rect in self.leaf_spawners:
-                if random.random() * 49999 < rect.width * rect.height:
-                    pos = (rect.x + random.random() * rect.width, rect.y + random.random() * rect.height)
-                    self.particles.append(Particle(self, "leaf", pos, velocity=[-0.1, 0.3], frame=random.randint(0, 20)))
-
-            self.scroll[0] += (self.player.rect().centerx - self.display.get_width() / 2 - self.scroll[0]) / 30
-            self.scroll[1] += (self.player.rect().centery - self.display.get_height() / 2 - self.scroll[1]) / 30
-            render_scroll = (int(self.scroll[0]), int(self.scroll[1]))
+                self.scroll[0] += (self.player.rect().centerx - self.display.get_width() / 2 - self.scroll[0]) / 30
+                self.scroll[1] += (self.player.rect().centery - self.display.get_height() / 2 - self.scroll[1]) / 30
+                self.profiler.lap("update:level")
 
-            self.clouds.update()
-            self.clouds.render(self.nonoutline_display, offset=render_scroll)
-            self.tilemap.render(self.display, offset=render_scroll)
+                self.clouds.update()
+                self.profiler.lap("update:clouds")
 
-            
-            for boss in self.bosses.copy():
-                kill = boss.update(self.tilemap)
-                boss.render(self.display, offset=render_scroll)
-                
-                if kill:
-                    self.bosses.remove(boss)
+                for boss in self.bosses.copy():
+                    kill = boss.update(self.tilemap)
+                    if kill:
+                        self.bosses.remove(boss)
+                self.profiler.lap("update:bosses")
 
-            for enemy in self.enemies.copy():
-                kill = enemy.update(self.tilemap)
-                enemy.render(self.display, offset=render_scroll)
-                if kill:
-                    self.enemies.remove(enemy)
-
-            if self.life > 0:
-                self.player.update(self.tilemap, (self.movement[1] - self.movement[0], 0), details=self.settings["3"])
-                self.player.render(self.display, offset=render_scroll)
-
-            for projectile in self.projectiles.copy():
-                kill = projectile.update()
-                projectile.render(self.display, offset=render_scroll, details=self.settings["3"])
-
-                if abs(self.player.dashing) < 50:
-                    if self.player.rect().collidepoint(projectile.pos):
-                        for i in range(30):
-                            angle = random.random() * math.pi * 2
-                            speed = random.random() * 5
-                            self.sparks.append(Spark(self.player.rect().center, angle, 2 + random.random()))
-                            self.particles.append(Particle(self, "particle", self.player.rect().center, [math.cos(angle + math.pi) * speed * 0.5, math.sin(angle + math.pi) * speed * 0.5], random.randint(0, 7)))
-
-                        self.life -= projectile.damage
-                        self.projectiles.remove(projectile)
-                        self.screen_shake = max(16, self.screen_shake)
-                        self.sfx["hit"].play()
-                
-                if kill:
-                    self.projectiles.remove(projectile)
-                        
+                for enemy in self.enemies.copy():
+                    kill = enemy.update(self.tilemap)
+                    if kill:
+                        self.enemies.remove(enemy)
+                self.profiler.lap("update:enemies")
 
-            if self.player.air_time > 400 or self.life <= -60:
-                self.load_level(self.level, MAPS_PATH)
-                self.player.dashing = 0
-            
-            for spark in self.sparks.copy():
-                kill = spark.update()
-                spark.render(self.display, render_scroll)
-                if kill:
-                    self.sparks.remove(spark)
-            
-            if self.settings["2"]:
-                display_mask = pygame.mask.from_surface(self.display)
-                display_silhouette = display_mask.to_surface(setcolor=(0, 0, 0, 180), unsetcolor=(0, 0, 0, 0))
-                for offset in [(-1,0), (1,0), (0,-1), (0,1)]:
-                    self.nonoutline_display.blit(display_silhouette, offset)
+                if self.life > 0:
+                    self.player.update(self.tilemap, (self.movement[1] - self.movement[0], 0), details=self.settings["3"])
+                self.profiler.lap("update:player")
 
+                self.update_projectiles()
+                self.profiler.lap("update:projectiles")
 
-            for particle in self.particles.copy():
-                kill = particle.update()
-                particle.render(self.display, offset=render_scroll)
+                if self.player.air_time > 400 or self.life <= -60:
+                    self.load_level(self.level, MAPS_PATH)
+                    self.player.dashing = 0
+                
+                self.sparks.update()
+                self.profiler.lap("update:sparks")
+                self.particles.update()
+                self.profiler.lap("update:particles")
+
+            if self.rendering:
+                alpha = self.accumulator / STEP_MS
+                self.display.fill((0, 0, 0, 0))
+                outline = self.outline if self.settings["2"] else None
+                if outline:
+                    outline.clear()
+                self.nonoutline_display.blit(self.render_targets.layer(self.assets["background"], self.display.get_size()), (0,0))
+
+                render_scroll = self.interpolated_scroll(alpha)
+                self.profiler.lap("render:background")
+
+                self.clouds.render(self.nonoutline_display, offset=render_scroll)
+                self.profiler.lap("render:clouds")
+                self.tilemap.render(self.display, offset=render_scroll, outline=outline)
+                self.profiler.lap("render:tilemap")
+
+                for boss in self.bosses:
+                    boss.render(self.display, offset=self.interpolated_offset(boss, render_scroll, alpha), outline=outline)
+                self.profiler.lap("render:bosses")
+
+                for enemy in self.enemies:
+                    enemy.render(self.display, offset=self.interpolated_offset(enemy, render_scroll, alpha), outline=outline)
+                self.profiler.lap("render:enemies")
+
+                if self.life > 0:
+                    self.player.render(self.display, offset=self.interpolated_offset(self.player, render_scroll, alpha), outline=outline)
+                self.profiler.lap("render:player")
+
+                self.render_projectiles(render_scroll, alpha, outline=outline)
+                self.profiler.lap("render:projectiles")
+                self.sparks.render(self.display, render_scroll, outline=outline)
+                self.profiler.lap("render:sparks")
+                
+                if outline:
+                    outline.render(self.nonoutline_display)
+                self.profiler.lap("render:outline")
 
-                if particle.type == "leaf":
-                    particle.pos[0] += math.sin(particle.animation.frame * 0.035) * 0.3
+                self.particles.render(self.display, offset=render_scroll)
+                self.profiler.lap("render:particles")
                 
-                if kill:
-                    self.particles.remove(particle)
-            
-            for i in range(self.life):
-                self.display.blit(self.assets["life"], (21 * (i - 1) + 26, 5)) 
+                for i in range(self.life):
+                    self.display.blit(self.assets["life"], (21 * (i - 1) + 26, 5)) 
+                self.profiler.lap("render:hud")
 
-            for event in pygame.event.get():
+            for event in self.poll_events():
                 if event.type == QUIT:
                     pygame.quit()
                     sys.exit()
@@ -282,6 +414,8 @@ class Game:
                         self.pickup = True
                     if event.key == K_F2:
                         self.settings["1"] = not self.settings["1"]
+                    if event.key == K_F3:
+                        self.profiler.toggle_overlay()
                 if event.type == KEYUP:
                     if event.key == K_a:
                         self.movement[0] = False
@@ -292,24 +426,21 @@ class Game:
                 if event.type == MOUSEBUTTONDOWN:
                     if event.button == 1:
                         self.player.dash()
+            self.profiler.lap("events")
         
-            if self.transition:
-                transition_surf = pygame.Surface(self.display.get_size())
-                pygame.draw.circle(transition_surf, (255, 255, 255), (self.display.get_width() // 2, self.display.get_height() // 2), (30 - abs(self.transition)) * 8)
-                transition_surf.set_colorkey((255, 255, 255))
-                self.display.blit(transition_surf, (0,0))
-        
-            self.nonoutline_display.blit(self.display, (0,0))
-        
-            screenshake_offset = (random.random() * self.screen_shake - self.screen_shake / 2, random.random() * self.screen_shake - self.screen_shake / 2)
-            self.screen.blit(pygame.transform.scale(self.nonoutline_display, self.screen.get_size()), screenshake_offset)
+            if self.rendering:
+                self.transition_effect.render(self.display, self.transition)
+            
+                self.nonoutline_display.blit(self.display, (0,0))
+            
+                screenshake_offset = (self.fx_random.random() * self.screen_shake - self.screen_shake / 2, self.fx_random.random() * self.screen_shake - self.screen_shake / 2)
+                self.render_targets.present(self.nonoutline_display, screenshake_offset)
+            self.profiler.lap("render:upscale")
 
             if self.paused:
                 self.pause_game()
         
-            current_fps(self.mainClock, self.game_font, self.screen, "black", self.settings["1"])
-            pygame.display.update()
-            self.mainClock.tick(60)
+            self.end_frame()
 
     def main_menu(self):
         # MARK: Main menu
@@ -322,10 +453,12 @@ class Game:
 
         settings_popup = Popup(self, (50, 20), (300, 200), self.game_font, text=["Show fps", "Show outline", "Show details"])
 
+        # levels share cached Tilemaps, so the menu backdrop gets its own
+        self.tilemap = Tilemap(self, tile_size=16)
         self.tilemap.load_map("./map1.json")
 
         leaf_spawners = []
-        particles = []
+        particles = ParticleSystem(self)
         enemies = []
         levels = []
 
@@ -335,7 +468,7 @@ class Game:
         clicking = False
         picking_stage = False
 
-        for i in range(len(sorted(os.listdir("data/maps")))):
+        for i in range(self.levels.level_count("./data/maps/")):
             levels.append(Level_selector(self, (23 * (i - 1) + 72, self.display.get_height() // 2 - 20), (20, 20), game_font, int(i + 1)))
 
         for tree in self.tilemap.extract([("large_decor", 1), ("large_decor", 4)], keep=True):
@@ -369,7 +502,10 @@ class Game:
                 settings_popup.show = True
             
             self.display.fill((0, 0, 0, 0))
-            self.nonoutline_display.blit(pygame.transform.scale(self.assets["background"], self.display.get_size()), (0,0))
+            outline = self.outline if self.settings["2"] else None
+            if outline:
+                outline.clear()
+            self.nonoutline_display.blit(self.render_targets.layer(self.assets["background"], self.display.get_size()), (0,0))
 
             
             if not flip_scroll[0]:
@@ -390,35 +526,25 @@ class Game:
 
             self.clouds.update()
             self.clouds.render(self.nonoutline_display, render_scroll)
-            self.tilemap.render(self.display, render_scroll)
+            self.tilemap.render(self.display, render_scroll, outline=outline)
 
             
             for enemy in enemies.copy():
                 kill = enemy.update(self.tilemap, shoot=False)
-                enemy.render(self.display, offset=render_scroll)
+                enemy.render(self.display, offset=render_scroll, outline=outline)
                 if kill:
                     enemies.remove(enemy)
 
             for rect in leaf_spawners:
-                if random.random() * 49999 < rect.width * rect.height:
-                    pos = (rect.x + random.random() * rect.width, rect.y + random.random() * rect.height)
-                    particles.append(Particle(self, "leaf", pos, velocity=[-0.1, 0.3], frame=random.randint(0, 20)))
+                if self.random.random() * 49999 < rect.width * rect.height:
+                    pos = (rect.x + self.random.random() * rect.width, rect.y + self.random.random() * rect.height)
+                    particles.spawn("leaf", pos, velocity=[-0.1, 0.3], frame=self.random.randint(0, 20))
             
-            if self.settings["2"]:
-                display_mask = pygame.mask.from_surface(self.display)
-                display_silhouette = display_mask.to_surface(setcolor=(0, 0, 0, 180), unsetcolor=(0, 0, 0, 0))
-                for offset in [(-1,0), (1,0), (0,-1), (0,1)]:
-                    self.nonoutline_display.blit(display_silhouette, offset)
+            if outline:
+                outline.render(self.nonoutline_display)
             
-            for particle in particles.copy():
-                kill = particle.update()
-                particle.render(self.display, render_scroll)
-
-                if particle.type == "leaf":
-                    particle.pos[0] += math.sin(particle.animation.frame * 0.035) * 0.3
-                
-                if kill:
-                    particles.remove(particle)
+            particles.update()
+            particles.render(self.display, render_scroll)
             
             if picking_stage:
                 for level in levels:
@@ -452,7 +578,7 @@ class Game:
 
             self.nonoutline_display.blit(self.display, (0,0))
             
-            self.screen.blit(pygame.transform.scale(self.nonoutline_display, self.screen.get_size()), (0,0))
+            self.render_targets.present(self.nonoutline_display)
             
             current_fps(self.mainClock, self.game_font, self.screen, "black", self.settings["1"])
             pygame.display.update()
@@ -461,7 +587,6 @@ class Game:
     def dodge_mode(self):
         # MARK: Dodge mode
         MAPS_PATH = "./data/dodging_maps/"
-        SAVE_PATH = "./data/save.json"
 
         picked_map = 0
 
@@ -476,116 +601,129 @@ class Game:
 
         clicking = False
         
+        self.begin_session(MODE_DODGE, picked_map)
         self.load_level(picked_map, MAPS_PATH)
-        while True:
+        game_over = False
+        self.accumulator = STEP_MS
+        while self.running():
             mouse_pos = pygame.mouse.get_pos()
             mouse_pos = (mouse_pos[0] / 3.2, mouse_pos[1] / 3)
 
-            self.display.fill((0, 0, 0, 0))
-            self.nonoutline_display.blit(pygame.transform.scale(self.assets["background"], self.display.get_size()), (0,0))
-
-            self.screen_shake = max(0, self.screen_shake - 1)
-
-            if not len(self.enemies):
-                pass
-            if self.transition < 0:
-                self.transition += 1
-
-            for rect in self.leaf_spawners:
-                if random.random() * 49999 < rect.width * rect.height:
-                    pos = (rect.x + random.random() * rect.width, rect.y + random.random() * rect.height)
-                    self.particles.append(Particle(self, "leaf", pos, velocity=[-0.1, 0.3], frame=random.randint(0, 20)))
-
-            self.scroll[0] += (self.player.rect().centerx - self.display.get_width() / 2 - self.scroll[0]) / 30
-            self.scroll[1] += (self.player.rect().centery - self.display.get_height() / 2 - self.scroll[1]) / 30
-            render_scroll = (int(self.scroll[0]), int(self.scroll[1]))
-
-            self.clouds.update()
-            self.clouds.render(self.nonoutline_display, offset=render_scroll)
-            self.tilemap.render(self.display, offset=render_scroll)
-
-            for enemy in self.enemies.copy():
-                kill = enemy.update(self.tilemap)
-                enemy.render(self.display, offset=render_scroll)
-                if kill:
-                    self.enemies.remove(enemy)
-
-            if self.life > 0:
-                self.player.update(self.tilemap, (self.movement[1] - self.movement[0], 0), details=self.settings["3"])
-                self.player.render(self.display, offset=render_scroll)
-
-            for projectile in self.projectiles.copy():
-                kill = projectile.update()
-                projectile.render(self.display, offset=render_scroll, details=self.settings["3"])
-
-                if abs(self.player.dashing) < 50:
-                    if self.player.rect().collidepoint(projectile.pos):
-                        for i in range(30):
-                            angle = random.random() * math.pi * 2
-                            speed = random.random() * 5
-                            self.sparks.append(Spark(self.player.rect().center, angle, 2 + random.random()))
-                            self.particles.append(Particle(self, "particle", self.player.rect().center, [math.cos(angle + math.pi) * speed * 0.5, math.sin(angle + math.pi) * speed * 0.5], random.randint(0, 7)))
-
-                        self.projectiles.remove(projectile)
-                        self.life -= 1
-                        self.screen_shake = max(16, self.screen_shake)
-                        self.sfx["hit"].play()
+            steps = 0
+            while self.accumulator >= STEP_MS and steps < MAX_STEPS:
+                self.accumulator -= STEP_MS
+                steps += 1
+                self.steps += 1
+                self.last_scroll = tuple(self.scroll)
+
+                self.screen_shake = max(0, self.screen_shake - 1)
+
+                if not len(self.enemies):
+                    pass
+                if self.transition < 0:
+                    self.transition += 1
+
+                for rect in self.leaf_spawners:
+                    if self.random.random() * 49999 < rect.width * rect.height:
+                        pos = (rect.x + self.random.random() * rect.width, rect.y + self.random.random() * rect.height)
+                        self.particles.spawn("leaf", pos, velocity=[-0.1, 0.3], frame=self.random.randint(0, 20))
+
+                self.scroll[0] += (self.player.rect().centerx - self.display.get_width() / 2 - self.scroll[0]) / 30
+                self.scroll[1] += (self.player.rect().centery - self.display.get_height() / 2 - self.scroll[1]) / 30
+                self.profiler.lap("update:level")
+
+                self.clouds.update()
+                self.profiler.lap("update:clouds")
+
+                for enemy in self.enemies.copy():
+                    kill = enemy.update(self.tilemap)
+                    if kill:
+                        self.enemies.remove(enemy)
+                self.profiler.lap("update:enemies")
+
+                if self.life > 0:
+                    self.player.update(self.tilemap, (self.movement[1] - self.movement[0], 0), details=self.settings["3"])
+                self.profiler.lap("update:player")
+
+                score += self.update_projectiles(damage=1) * 100
+                self.profiler.lap("update:projectiles")
+
+                self.sparks.update()
+                self.profiler.lap("update:sparks")
+                self.particles.update()
+                self.profiler.lap("update:particles")
                 
-                if kill:
-                    score += 100
-                    self.projectiles.remove(projectile)
-                        
-            for spark in self.sparks.copy():
-                kill = spark.update()
-                spark.render(self.display, render_scroll)
-                if kill:
-                    self.sparks.remove(spark)
-            
-            if self.settings["2"]:
-                display_mask = pygame.mask.from_surface(self.display)
-                display_silhouette = display_mask.to_surface(setcolor=(0, 0, 0, 180), unsetcolor=(0, 0, 0, 0))
-                for offset in [(-1,0), (1,0), (0,-1), (0,1)]:
-                    self.nonoutline_display.blit(display_silhouette, offset)
+                game_over = self.life <= 0 or self.player.air_time > 400
+                if game_over:
+                    if score > self.data["highest_score"]:
+                        self.data["highest_score"] = score
+                        if self.save_path:
+                            saving(self.save_path, self.data)
+                        highest_score = self.data["highest_score"]
+                    self.player.velocity[0] = 0
+                    self.player.velocity[1] = 0
+                    score = 0
+                    current_tscore.update(f"Score : {current_score}")
+                    self.life -= 1
+                    if result_popup.rect.collidepoint(mouse_pos) and clicking:
+                        if self.life <= 10:
+                            self.transition = min(30, self.transition + 1)
+                        if self.life <= -60:
+                            self.load_level(picked_map, MAPS_PATH)
+                            current_score = 0
+                
+                if current_score < score:
+                    current_score = score
+                self.profiler.lap("update:level")
+
+            if self.rendering:
+                alpha = self.accumulator / STEP_MS
+                self.display.fill((0, 0, 0, 0))
+                outline = self.outline if self.settings["2"] else None
+                if outline:
+                    outline.clear()
+                self.nonoutline_display.blit(self.render_targets.layer(self.assets["background"], self.display.get_size()), (0,0))
+
+                render_scroll = self.interpolated_scroll(alpha)
+                self.profiler.lap("render:background")
+
+                self.clouds.render(self.nonoutline_display, offset=render_scroll)
+                self.profiler.lap("render:clouds")
+                self.tilemap.render(self.display, offset=render_scroll, outline=outline)
+                self.profiler.lap("render:tilemap")
+
+                for enemy in self.enemies:
+                    enemy.render(self.display, offset=self.interpolated_offset(enemy, render_scroll, alpha), outline=outline)
+                self.profiler.lap("render:enemies")
+
+                if self.life > 0:
+                    self.player.render(self.display, offset=self.interpolated_offset(self.player, render_scroll, alpha), outline=outline)
+                self.profiler.lap("render:player")
+
+                self.render_projectiles(render_scroll, alpha, outline=outline)
+                self.profiler.lap("render:projectiles")
+                self.sparks.render(self.display, render_scroll, outline=outline)
+                self.profiler.lap("render:sparks")
+                
+                if outline:
+                    outline.render(self.nonoutline_display)
+                self.profiler.lap("render:outline")
 
+                self.particles.render(self.display, offset=render_scroll)
+                self.profiler.lap("render:particles")
+                
+                for i in range(self.life):
+                    self.display.blit(self.assets["life"], (21 * (i - 1) + 26, 5)) 
 
-            for particle in self.particles.copy():
-                kill = particle.update()
-                particle.render(self.display, offset=render_scroll)
+                if game_over:
+                    result_popup.render(self.display)
+                    current_tscore.render(self.display)
 
-                if particle.type == "leaf":
-                    particle.pos[0] += math.sin(particle.animation.frame * 0.035) * 0.3
-                
-                if kill:
-                    self.particles.remove(particle)
-            
-            for i in range(self.life):
-                self.display.blit(self.assets["life"], (21 * (i - 1) + 26, 5)) 
-            
-            if self.life <= 0 or self.player.air_time > 400:
-                if score > self.data["highest_score"]:
-                    self.data["highest_score"] = score
-                    saving(SAVE_PATH, self.data)
-                    highest_score = self.data["highest_score"]
-                self.player.velocity[0] = 0
-                self.player.velocity[1] = 0
-                score = 0
-                result_popup.render(self.display)
-                current_tscore.update(f"Score : {current_score}")
-                current_tscore.render(self.display)
-                self.life -= 1
-                if result_popup.rect.collidepoint(mouse_pos) and clicking:
-                    if self.life <= 10:
-                        self.transition = min(30, self.transition + 1)
-                    if self.life <= -60:
-                        self.load_level(picked_map, MAPS_PATH)
-                        current_score = 0
-            
-            if current_score < score:
-                current_score = score
-            score_text.update(score)
-            score_text.render(self.display)
+                score_text.update(score)
+                score_text.render(self.display)
+                self.profiler.lap("render:hud")
 
-            for event in pygame.event.get():
+            for event in self.poll_events():
                 if event.type == QUIT:
                     pygame.quit()
                     sys.exit()
@@ -604,6 +742,8 @@ class Game:
                         self.pickup = True
                     if event.key == K_F2:
                         self.settings["1"] = not self.settings["1"]
+                    if event.key == K_F3:
+                        self.profiler.toggle_overlay()
                 if event.type == KEYUP:
                     if event.key == K_a:
                         self.movement[0] = False
@@ -618,24 +758,30 @@ class Game:
                 if event.type == MOUSEBUTTONUP:
                     if event.button == 1:
                         clicking = False
+            self.profiler.lap("events")
         
-            if self.transition:
-                transition_surf = pygame.Surface(self.display.get_size())
-                pygame.draw.circle(transition_surf, (255, 255, 255), (self.display.get_width() // 2, self.display.get_height() // 2), (30 - abs(self.transition)) * 8)
-                transition_surf.set_colorkey((255, 255, 255))
-                self.display.blit(transition_surf, (0,0))
-        
-            self.nonoutline_display.blit(self.display, (0,0))
-        
-            screenshake_offset = (random.random() * self.screen_shake - self.screen_shake / 2, random.random() * self.screen_shake - self.screen_shake / 2)
-            self.screen.blit(pygame.transform.scale(self.nonoutline_display, self.screen.get_size()), screenshake_offset)
+            if self.rendering:
+                self.transition_effect.render(self.display, self.transition)
+            
+                self.nonoutline_display.blit(self.display, (0,0))
+            
+                screenshake_offset = (self.fx_random.random() * self.screen_shake - self.screen_shake / 2, self.fx_random.random() * self.screen_shake - self.screen_shake / 2)
+                self.render_targets.present(self.nonoutline_display, screenshake_offset)
+            self.profiler.lap("render:upscale")
 
             if self.paused:
                 self.pause_game()
         
-            current_fps(self.mainClock, self.game_font, self.screen, "black", self.settings["1"])
-            pygame.display.update()
-            self.mainClock.tick(60)
+            self.end_frame()
             
 
-Game().main_menu()
\ No newline at end of file
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--record", help="write the last level or dodge session's input to this file")
+    args = parser.parse_args()
+
+    game = Game(seed=args.seed)
+    if args.record:
+        game.recorder = InputRecorder(args.record)
+    game.main_menu()
\ No newline at end of file
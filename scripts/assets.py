@@ -0,0 +1,155 @@
+import os
+import json
+import mmap
+import time
+import struct
+import pygame
+from concurrent.futures import ThreadPoolExecutor
+from scripts.utils import ORIGINAL_IMG_PATH, Animation
+
+ASSET_MANIFEST_PATH = "data/assets.json"
+ASSET_CACHE_PATH = "data/cache/"
+PACK_MAGIC = b"DSAP"
+PACK_VERSION = 1
+# magic, version, length of the JSON index that follows
+PACK_HEADER = struct.Struct("<4sHI")
+
+def load_manifest(section, path=ASSET_MANIFEST_PATH):
+    with open(path, "r") as f:
+        return json.load(f)[section]
+
+def entry_paths(entry):
+    if "image" in entry:
+        return [entry["image"]]
+    return [entry["images"] + "/" + img_name for img_name in sorted(os.listdir(ORIGINAL_IMG_PATH + entry["images"]))]
+
+def pack_key(path, flip):
+    return path + ("|flip" if flip else "")
+
+def source_stamp(path):
+    stat = os.stat(ORIGINAL_IMG_PATH + path)
+    return [stat.st_mtime, stat.st_size]
+
+def decode(path, flip):
+    # runs on the pool; only touches unconverted surfaces, conversion needs the display so it stays on the main thread
+    img = pygame.image.load(ORIGINAL_IMG_PATH + path)
+    if flip:
+        img = pygame.transform.flip(img, True, False)
+    return img.get_size(), pygame.image.tobytes(img, "RGBA")
+
+def open_pack(path):
+    try:
+        with open(path, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (FileNotFoundError, ValueError, OSError):
+        return None, {}, 0
+
+    try:
+        magic, version, index_size = PACK_HEADER.unpack_from(data)
+        if magic == PACK_MAGIC and version == PACK_VERSION:
+            start = PACK_HEADER.size + index_size
+            return data, json.loads(data[PACK_HEADER.size:start]), start
+    except (struct.error, ValueError):
+        pass
+    data.close()
+    return None, {}, 0
+
+def write_pack(path, buffers, stamps):
+    index = {}
+    offset = 0
+    for key, (size, pixels) in buffers.items():
+        index[key] = stamps[key] + [size[0], size[1], offset]
+        offset += len(pixels)
+    index = json.dumps(index).encode()
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + ".tmp", "wb") as f:
+        f.write(PACK_HEADER.pack(PACK_MAGIC, PACK_VERSION, len(index)))
+        f.write(index)
+        for size, pixels in buffers.values():
+            f.write(pixels)
+    os.replace(path + ".tmp", path)
+
+def convert(size, pixels, alpha):
+    img = pygame.image.frombuffer(pixels, size, "RGBA")
+    if alpha:
+        return img.convert_alpha()
+    img = img.convert()
+    img.set_colorkey((0, 0, 0))
+    return img
+
+class AssetManager:
+    def __init__(self, name, manifest, path=ASSET_CACHE_PATH, workers=None):
+        self.manifest = manifest
+        self.cache_path = path + name + ".bin"
+        self.workers = workers or min(8, os.cpu_count() or 1)
+        self.keys = {}
+        self.timings = {}
+
+    def load(self):
+        start = time.perf_counter()
+        wanted = {}
+        for name, entry in self.manifest.items():
+            flip = entry.get("flip", False)
+            self.keys[name] = []
+            for path in entry_paths(entry):
+                self.keys[name].append(pack_key(path, flip))
+                wanted[pack_key(path, flip)] = (path, flip, entry["alpha"])
+        stamps = {key: source_stamp(path) for key, (path, flip, alpha) in wanted.items()}
+
+        data, index, data_start = open_pack(self.cache_path)
+        view = memoryview(data) if data else None
+        buffers = {}
+        slices = []
+        misses = []
+        for key in wanted:
+            cached = index.get(key)
+            if cached and cached[:2] == stamps[key]:
+                width, height, offset = cached[2:]
+                slices.append(view[data_start + offset:data_start + offset + width * height * 4])
+                buffers[key] = ((width, height), slices[-1])
+            else:
+                misses.append(key)
+        self.timings["pack"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        if misses:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                decoded = executor.map(decode, [wanted[key][0] for key in misses], [wanted[key][1] for key in misses])
+                buffers.update(zip(misses, decoded))
+        self.timings["decode"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        surfaces = {key: convert(size, pixels, wanted[key][2]) for key, (size, pixels) in buffers.items()}
+        self.timings["convert"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        stale = misses or len(index) != len(wanted)
+        if stale:
+            buffers = {key: (size, bytes(pixels)) for key, (size, pixels) in buffers.items()}
+        # the mapping only closes once no slice of it is left
+        if data:
+            for pixels in slices:
+                pixels.release()
+            view.release()
+            data.close()
+        if stale:
+            write_pack(self.cache_path, buffers, stamps)
+        self.timings["write"] = time.perf_counter() - start
+
+        self.timings["hits"] = len(wanted) - len(misses)
+        self.timings["misses"] = len(misses)
+        return surfaces
+
+    def build(self):
+        surfaces = self.load()
+        assets = {}
+        for name, entry in self.manifest.items():
+            images = [surfaces[key] for key in self.keys[name]]
+            if "animation" in entry:
+                assets[name] = Animation(images, **entry["animation"])
+            elif "image" in entry:
+                assets[name] = images[0]
+            else:
+                assets[name] = images
+        return assets
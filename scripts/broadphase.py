@@ -0,0 +1,48 @@
+class Broadphase:
+    def __init__(self, cell_size=32):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.items = {}
+
+    def __len__(self):
+        return len(self.items)
+
+    def clear(self):
+        self.cells = {}
+        self.items = {}
+
+    def cells_for(self, rect):
+        cells = []
+        for x in range(rect.left // self.cell_size, (rect.right - 1) // self.cell_size + 1):
+            for y in range(rect.top // self.cell_size, (rect.bottom - 1) // self.cell_size + 1):
+                cells.append((x, y))
+        return tuple(cells)
+
+    def place(self, item, cells):
+        old_cells = self.items.get(item)
+        if old_cells == cells:
+            return
+        if old_cells:
+            for cell in old_cells:
+                del self.cells[cell][item]
+        for cell in cells:
+            self.cells.setdefault(cell, {})[item] = True
+        self.items[item] = cells
+
+    def move(self, item, rect):
+        self.place(item, self.cells_for(rect))
+
+    def move_point(self, item, pos):
+        self.place(item, ((int(pos[0] // self.cell_size), int(pos[1] // self.cell_size)),))
+
+    def remove(self, item):
+        if item in self.items:
+            for cell in self.items.pop(item):
+                del self.cells[cell][item]
+
+    def query(self, rect):
+        matches = {}
+        for cell in self.cells_for(rect):
+            if cell in self.cells:
+                matches.update(self.cells[cell])
+        return list(matches)
@@ -1,25 +1,23 @@
 import pygame
 import math
-import random
 import time
-from scripts.particle import Particle
 from scripts.projectile import Projectile, Boss_projectile
-from scripts.spark import Spark
 
 class PhysicsEntity:
     def __init__(self, game, e_type, pos, speed, size):
         self.game = game
         self.type = e_type
         self.pos = list(pos)
+        self.last_pos = tuple(pos)
         self.speed = speed
         self.size = list(size)
         self.velocity = [0,0]
         self.colissions = {"up": False, "down": False, "left": False, "right": False}
 
-        self.action = ""
+        self.action = "idle"
         self.anim_offset = (-3, -3)
         self.flip = False
-        self.set_action("idle")
+        self.animation = self.game.assets[self.type + "/" + self.action].play()
     
     def rect(self):
         return pygame.Rect(self.pos[0], self.pos[1], self.size[0], self.size[1])
@@ -27,16 +25,17 @@ class PhysicsEntity:
     def set_action(self, action):
         if action != self.action:
             self.action = action
-            self.animation = self.game.assets[self.type + "/" + self.action].copy()
+            self.animation.restart(self.game.assets[self.type + "/" + self.action])
     
     def update(self, tilemap, movement=(0,0)):
+        self.last_pos = (self.pos[0], self.pos[1])
         self.colissions = {"up": False, "down": False, "left": False, "right": False}
 
         frame_movement = (movement[0] + self.velocity[0], movement[1] + self.velocity[1])
 
         self.pos[0] += frame_movement[0] * self.speed
         entity_rect = self.rect()
-        for rect in tilemap.physics_rects_around(self.pos):
+        for rect in tilemap.physics_rects_around(entity_rect):
             if entity_rect.colliderect(rect):
                 if frame_movement[0] > 0:
                     entity_rect.right = rect.left
@@ -48,7 +47,7 @@ class PhysicsEntity:
                     
         self.pos[1] += frame_movement[1]
         entity_rect = self.rect()
-        for rect in tilemap.physics_rects_around(self.pos):
+        for rect in tilemap.physics_rects_around(entity_rect):
             if entity_rect.colliderect(rect):
                 if frame_movement[1] > 0:
                     entity_rect.bottom = rect.top
@@ -70,8 +69,11 @@ class PhysicsEntity:
         
         self.animation.update()
 
-    def render(self, screen, offset=(0,0)):
-        screen.blit(pygame.transform.flip(self.animation.img(), self.flip, False), (self.pos[0] - offset[0], self.pos[1] - offset[1]))
+    def render(self, screen, offset=(0,0), outline=None):
+        img = self.animation.img(self.flip)
+        screen.blit(img, (self.pos[0] - offset[0], self.pos[1] - offset[1]))
+        if outline:
+            outline.blit(img, (self.pos[0] - offset[0], self.pos[1] - offset[1]))
 
 class Player(PhysicsEntity):
     def __init__(self, game, pos, speed, size):
@@ -91,13 +93,13 @@ class Player(PhysicsEntity):
             if details:
                 if movement[0] != 0 or self.dashing:
                     if tilemap.solid_check((self.pos[0], self.pos[1] + 23), ai=False, t_type="grass"):
-                        pvelocity = [0, -math.sin(random.random() * 9) * 0.2]
-                        luck = random.random() + 0.2 + abs(self.dashing)
+                        pvelocity = [0, -math.sin(self.game.random.random() * 9) * 0.2]
+                        luck = self.game.random.random() + 0.2 + abs(self.dashing)
                         if luck > 40 if self.dashing else luck > 1.1:
                             if self.flip:
-                                self.game.particles.append(Particle(self.game, "leaf", self.rect().bottomright, pvelocity, random.randint(0, 20)))
+                                self.game.particles.spawn("leaf", self.rect().bottomright, pvelocity, self.game.random.randint(0, 20))
                             else:
-                                self.game.particles.append(Particle(self.game, "leaf", self.rect().bottomleft, pvelocity, random.randint(0, 20)))
+                                self.game.particles.spawn("leaf", self.rect().bottomleft, pvelocity, self.game.random.randint(0, 20))
                 
         else:
             self.air_time += 1
@@ -120,10 +122,10 @@ class Player(PhysicsEntity):
         
         if abs(self.dashing) in {60, 50}:
             for i in range(20):
-                angle = random.random() * math.pi * 2
-                speed = random.random() * 0.5 + 0.5
+                angle = self.game.random.random() * math.pi * 2
+                speed = self.game.random.random() * 0.5 + 0.5
                 pvelocity = [math.cos(angle) * speed, math.sin(angle) * speed]
-                self.game.particles.append(Particle(self.game, "particle", self.rect().center, pvelocity, random.randint(0, 7)))    
+                self.game.particles.spawn("particle", self.rect().center, pvelocity, self.game.random.randint(0, 7))
         if self.dashing > 0:
             self.dashing = max(0, self.dashing - 1)
         if self.dashing < 0:
@@ -132,8 +134,8 @@ class Player(PhysicsEntity):
             self.velocity[0] = abs(self.dashing) / self.dashing * 4
             if abs(self.dashing) == 51:
                 self.velocity[0] *= 0.1
-            pvelocity = [abs(self.dashing) / self.dashing * random.random() * 3, 0]
-            self.game.particles.append(Particle(self.game, "particle", self.rect().center, pvelocity, random.randint(0, 7)))    
+            pvelocity = [abs(self.dashing) / self.dashing * self.game.random.random() * 3, 0]
+            self.game.particles.spawn("particle", self.rect().center, pvelocity, self.game.random.randint(0, 7))
                 
         
         if self.velocity[0] > 0:
@@ -159,9 +161,9 @@ class Player(PhysicsEntity):
             self.dashing = -60 if self.flip else 60
             self.game.sfx["dash"].play()
     
-    def render(self, screen, offset=(0, 0)):
+    def render(self, screen, offset=(0, 0), outline=None):
         if abs(self.dashing) <= 50:
-            super().render(screen, offset)
+            super().render(screen, offset, outline)
 
 class Enemy(PhysicsEntity):
     def __init__(self, game, pos, speed, size):
@@ -184,17 +186,17 @@ class Enemy(PhysicsEntity):
                 angle = math.atan2(self.game.player.pos[1] - self.pos[1] + 5, self.game.player.pos[0] - self.pos[0] + 7)
                 if self.flip and dis[0] < 0:
                     self.game.sfx["shoot"].play()
-                    self.game.projectiles.append(Projectile(self.game, [self.rect().centerx - 7, self.rect().centery], 1.5, [math.cos(angle), math.sin(angle)]))
+                    self.game.projectiles.append(self.game.projectile_pools[Projectile].acquire([self.rect().centerx - 7, self.rect().centery], 1.5, [math.cos(angle), math.sin(angle)]))
                     for i in range(4):
-                        self.game.sparks.append(Spark(self.game.projectiles[-1].pos, random.random() - 0.5 + math.pi, 2 + random.random()))
+                        self.game.sparks.spawn(self.game.projectiles[-1].pos, self.game.random.random() - 0.5 + math.pi, 2 + self.game.random.random())
                 if not self.flip and dis[0] > 0:
                     self.game.sfx["shoot"].play()
-                    self.game.projectiles.append(Projectile(self.game, [self.rect().centerx + 7, self.rect().centery], 1.5, [math.cos(angle), math.sin(angle)]))
+                    self.game.projectiles.append(self.game.projectile_pools[Projectile].acquire([self.rect().centerx + 7, self.rect().centery], 1.5, [math.cos(angle), math.sin(angle)]))
                     for i in range(4):
-                        self.game.sparks.append(Spark(self.game.projectiles[-1].pos, random.random() - 0.5, 2 + random.random()))
+                        self.game.sparks.spawn(self.game.projectiles[-1].pos, self.game.random.random() - 0.5, 2 + self.game.random.random())
                     
-        elif random.random() < 0.01:
-            self.walking = random.randint(30, 120)
+        elif self.game.random.random() < 0.01:
+            self.walking = self.game.random.randint(30, 120)
         
         if movement[0] != 0:
             self.set_action("run")
@@ -206,23 +208,27 @@ class Enemy(PhysicsEntity):
                 self.game.sfx["hit"].play()
                 self.game.screen_shake = max(16, self.game.screen_shake)
                 for i in range(30):
-                    angle = random.random() * math.pi * 2
-                    speed = random.random() * 5
-                    self.game.sparks.append(Spark(self.rect().center, angle, 2 + random.random()))
-                    self.game.particles.append(Particle(self.game, "particle", self.rect().center, [math.cos(angle + math.pi) * speed * 0.5, math.sin(angle + math.pi) * speed * 0.5], random.randint(0, 7)))
-                self.game.sparks.append(Spark(self.rect().center, 0, 1 + random.random()))
-                self.game.sparks.append(Spark(self.rect().center, math.pi, 4 + random.random()))
+                    angle = self.game.random.random() * math.pi * 2
+                    speed = self.game.random.random() * 5
+                    self.game.sparks.spawn(self.rect().center, angle, 2 + self.game.random.random())
+                    self.game.particles.spawn("particle", self.rect().center, [math.cos(angle + math.pi) * speed * 0.5, math.sin(angle + math.pi) * speed * 0.5], self.game.random.randint(0, 7))
+                self.game.sparks.spawn(self.rect().center, 0, 1 + self.game.random.random())
+                self.game.sparks.spawn(self.rect().center, math.pi, 4 + self.game.random.random())
                 return True
 
         super().update(tilemap, movement)
     
-    def render(self, screen, offset=(0, 0)):
-        super().render(screen, offset)
+    def render(self, screen, offset=(0, 0), outline=None):
+        super().render(screen, offset, outline)
 
         if self.flip:
-            screen.blit(pygame.transform.flip(self.game.assets["shiruken"], True, False), (self.rect().centerx - offset[0] - 8, self.rect().centery - offset[1] + 1))
+            screen.blit(self.game.assets["shiruken/flipped"], (self.rect().centerx - offset[0] - 8, self.rect().centery - offset[1] + 1))
+            if outline:
+                outline.blit(self.game.assets["shiruken/flipped"], (self.rect().centerx - offset[0] - 8, self.rect().centery - offset[1] + 1))
         else:
             screen.blit(self.game.assets["shiruken"], (self.rect().centerx - offset[0] + 8, self.rect().centery - offset[1] + 1))
+            if outline:
+                outline.blit(self.game.assets["shiruken"], (self.rect().centerx - offset[0] + 8, self.rect().centery - offset[1] + 1))
 
 class Boss(PhysicsEntity):
     def __init__(self, game, pos, speed, size):
@@ -251,30 +257,30 @@ class Boss(PhysicsEntity):
                 if self.flip:
                     self.shooting = True
                     self.game.sfx["shoot"].play()
-                    self.game.projectiles.append(Boss_projectile(self.game, [self.rect().centerx - 10, self.rect().centery], 1.5, 0, angle, [math.cos(angle), math.sin(angle)]))
-                    self.game.projectiles.append(Boss_projectile(self.game, (self.game.projectiles[-1].pos[0] - math.cos(angle) * 8, self.game.projectiles[-1].pos[1] - math.sin(angle) * 8), 1.5, 1, angle, [math.cos(angle), math.sin(angle)], 2))
+                    self.game.projectiles.append(self.game.projectile_pools[Boss_projectile].acquire([self.rect().centerx - 10, self.rect().centery], 1.5, 0, angle, [math.cos(angle), math.sin(angle)]))
+                    self.game.projectiles.append(self.game.projectile_pools[Boss_projectile].acquire((self.game.projectiles[-1].pos[0] - math.cos(angle) * 8, self.game.projectiles[-1].pos[1] - math.sin(angle) * 8), 1.5, 1, angle, [math.cos(angle), math.sin(angle)], 2))
                     if self.life == 1:
-                        self.game.projectiles.append(Boss_projectile(self.game, (self.game.projectiles[-1].pos[0] - math.cos(angle) * 8, self.game.projectiles[-1].pos[1] - math.sin(angle) * 8), 1.5, 0, angle, [math.cos(angle), math.sin(angle)]))
+                        self.game.projectiles.append(self.game.projectile_pools[Boss_projectile].acquire((self.game.projectiles[-1].pos[0] - math.cos(angle) * 8, self.game.projectiles[-1].pos[1] - math.sin(angle) * 8), 1.5, 0, angle, [math.cos(angle), math.sin(angle)]))
                     for i in range(4):
-                        self.game.sparks.append(Spark(self.game.projectiles[-1].pos, random.random() - 0.5 + math.pi, 2 + random.random()))
+                        self.game.sparks.spawn(self.game.projectiles[-1].pos, self.game.random.random() - 0.5 + math.pi, 2 + self.game.random.random())
                 if not self.flip:
                     self.shooting = True
                     self.game.sfx["shoot"].play()
-                    self.game.projectiles.append(Boss_projectile(self.game, [self.rect().centerx + 7, self.rect().centery], 1.5, 0, angle, [math.cos(angle), math.sin(angle)]))
-                    self.game.projectiles.append(Boss_projectile(self.game, (self.game.projectiles[-1].pos[0] - math.cos(angle) * 8, self.game.projectiles[-1].pos[1] - math.sin(angle) * 8), 1.5, 1, angle, [math.cos(angle), math.sin(angle)], 2))
+                    self.game.projectiles.append(self.game.projectile_pools[Boss_projectile].acquire([self.rect().centerx + 7, self.rect().centery], 1.5, 0, angle, [math.cos(angle), math.sin(angle)]))
+                    self.game.projectiles.append(self.game.projectile_pools[Boss_projectile].acquire((self.game.projectiles[-1].pos[0] - math.cos(angle) * 8, self.game.projectiles[-1].pos[1] - math.sin(angle) * 8), 1.5, 1, angle, [math.cos(angle), math.sin(angle)], 2))
                     if self.life == 1:
-                        self.game.projectiles.append(Boss_projectile(self.game, (self.game.projectiles[-1].pos[0] - math.cos(angle) * 8, self.game.projectiles[-1].pos[1] - math.sin(angle) * 8), 1.5, 0, angle, [math.cos(angle), math.sin(angle)]))
+                        self.game.projectiles.append(self.game.projectile_pools[Boss_projectile].acquire((self.game.projectiles[-1].pos[0] - math.cos(angle) * 8, self.game.projectiles[-1].pos[1] - math.sin(angle) * 8), 1.5, 0, angle, [math.cos(angle), math.sin(angle)]))
                     for i in range(4):
-                        self.game.sparks.append(Spark(self.game.projectiles[-1].pos, random.random() - 0.5, 2 + random.random()))
+                        self.game.sparks.spawn(self.game.projectiles[-1].pos, self.game.random.random() - 0.5, 2 + self.game.random.random())
         
         if self.life == 1 and self.ult:
             angle = math.atan2(self.game.player.pos[1] - self.pos[1] - 5, self.game.player.pos[0] - self.pos[0] + 2)
             for i in range(100):
-                self.game.projectiles.append(Boss_projectile(self.game, [self.rect().centerx, self.rect().centery], 1.5, i, angle + (i / 2), [math.cos(angle + (i / 2)), math.sin(angle + (i / 2))]))
+                self.game.projectiles.append(self.game.projectile_pools[Boss_projectile].acquire([self.rect().centerx, self.rect().centery], 1.5, i, angle + (i / 2), [math.cos(angle + (i / 2)), math.sin(angle + (i / 2))]))
             self.ult = False
                     
-        elif random.random() < 0.02:
-            self.walking = random.randint(10, 40)
+        elif self.game.random.random() < 0.02:
+            self.walking = self.game.random.randint(10, 40)
         
         if movement[0] != 0:
             self.set_action("run")
@@ -288,12 +294,12 @@ class Boss(PhysicsEntity):
                     self.game.screen_shake = max(16, self.game.screen_shake)
                     self.life -= 1
                     for i in range(30):
-                        angle = random.random() * math.pi * 2
-                        speed = random.random() * 5
-                        self.game.sparks.append(Spark(self.rect().center, angle, 2 + random.random()))
-                        self.game.particles.append(Particle(self.game, "particle", self.rect().center, [math.cos(angle + math.pi) * speed * 0.5, math.sin(angle + math.pi) * speed * 0.5], random.randint(0, 7)))
-                    self.game.sparks.append(Spark(self.rect().center, 0, 1 + random.random()))
-                    self.game.sparks.append(Spark(self.rect().center, math.pi, 4 + random.random()))
+                        angle = self.game.random.random() * math.pi * 2
+                        speed = self.game.random.random() * 5
+                        self.game.sparks.spawn(self.rect().center, angle, 2 + self.game.random.random())
+                        self.game.particles.spawn("particle", self.rect().center, [math.cos(angle + math.pi) * speed * 0.5, math.sin(angle + math.pi) * speed * 0.5], self.game.random.randint(0, 7))
+                    self.game.sparks.spawn(self.rect().center, 0, 1 + self.game.random.random())
+                    self.game.sparks.spawn(self.rect().center, math.pi, 4 + self.game.random.random())
                     self.iframe = 20
             
             if self.life <= 0:
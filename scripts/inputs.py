@@ -0,0 +1,107 @@
+import json
+import atexit
+import struct
+import random
+import pygame
+
+INPUT_KEYS = (pygame.K_a, pygame.K_d, pygame.K_SPACE, pygame.K_k)
+MODE_LEVEL = 0
+MODE_DODGE = 1
+
+# recordings are a header (magic, mode, map id, seed, details) then one (step, kind, code) record per input event,
+# closed by an END_KIND record holding the last step the session simulated
+REPLAY_MAGIC = b"DSR2"
+REPLAY_HEADER = struct.Struct("<4sBhqB")
+REPLAY_RECORD = struct.Struct("<IBI")
+EVENT_KINDS = (pygame.KEYUP, pygame.KEYDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEBUTTONDOWN)
+END_KIND = 255
+
+def make_event(kind, code):
+    if kind in (pygame.KEYUP, pygame.KEYDOWN):
+        return pygame.event.Event(kind, key=code)
+    return pygame.event.Event(kind, button=code, pos=pygame.mouse.get_pos())
+
+class ScriptedInput:
+    def __init__(self, events):
+        # events are (step, event type, key or button), posted once the simulation reaches step
+        self.events = sorted(events, key=lambda event: event[0])
+        self.index = 0
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r") as f:
+            return cls([(step, pygame.KEYDOWN if action == "down" else pygame.KEYUP, pygame.key.key_code(key)) for step, action, key in json.load(f)])
+
+    def feed(self, step):
+        while self.index < len(self.events) and self.events[self.index][0] <= step:
+            pygame.event.post(make_event(self.events[self.index][1], self.events[self.index][2]))
+            self.index += 1
+
+class ReplayInput(ScriptedInput):
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        if data[:len(REPLAY_MAGIC)] != REPLAY_MAGIC:
+            raise ValueError(path + " is not an input recording")
+        # details spawns particles from game.random, so a replay has to use the recorded setting
+        magic, self.mode, self.map_id, self.seed, details = REPLAY_HEADER.unpack_from(data)
+        self.details = bool(details)
+
+        events = []
+        self.end_step = None
+        for step, kind, code in REPLAY_RECORD.iter_unpack(memoryview(data)[REPLAY_HEADER.size:]):
+            if kind == END_KIND:
+                self.end_step = step
+            else:
+                events.append((step, EVENT_KINDS[kind], code))
+        super().__init__(events)
+
+    def length(self):
+        # a session that never closed its recorder (a crash) has no end record and only reaches its last event
+        if self.end_step is not None:
+            return self.end_step
+        return self.events[-1][0] + 1 if self.events else 1
+
+class InputRecorder:
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+        self.last_step = 0
+        # quitting the game goes through sys.exit, which still runs this
+        atexit.register(self.close)
+
+    def begin(self, mode, map_id, seed, details):
+        self.close()
+        self.file = open(self.path, "wb")
+        self.file.write(REPLAY_HEADER.pack(REPLAY_MAGIC, mode, map_id, seed, details))
+        self.last_step = 0
+
+    def record(self, step, events):
+        # writes go through the file's buffer; nothing is flushed until close
+        if not self.file:
+            return
+        self.last_step = step
+        for event in events:
+            if event.type in (pygame.KEYUP, pygame.KEYDOWN) and event.key in INPUT_KEYS:
+                self.file.write(REPLAY_RECORD.pack(step, EVENT_KINDS.index(event.type), event.key))
+            elif event.type in (pygame.MOUSEBUTTONUP, pygame.MOUSEBUTTONDOWN) and event.button == 1:
+                self.file.write(REPLAY_RECORD.pack(step, EVENT_KINDS.index(event.type), event.button))
+
+    def close(self):
+        if self.file:
+            self.file.write(REPLAY_RECORD.pack(self.last_step, END_KIND, 0))
+            self.file.close()
+            self.file = None
+
+class RandomInput:
+    def __init__(self, seed=None, keys=INPUT_KEYS, rate=0.1):
+        self.random = random.Random(seed)
+        self.keys = keys
+        self.rate = rate
+        self.held = set()
+
+    def feed(self, step):
+        if self.random.random() < self.rate:
+            key = self.random.choice(self.keys)
+            pygame.event.post(make_event(pygame.KEYDOWN if key not in self.held else pygame.KEYUP, key))
+            self.held ^= {key}
@@ -0,0 +1,78 @@
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from scripts.tilemap import Tilemap, read_map
+from scripts.mapformat import source_stamp, map_source
+
+LEVEL_CACHE_SIZE = 4
+
+class Level:
+    # a parsed level template; restarts reuse it, so spawners and leaf spawners are kept as tuples callers copy out of
+    def __init__(self, tilemap, spawners, leaf_spawners):
+        self.tilemap = tilemap
+        self.spawners = spawners
+        self.leaf_spawners = leaf_spawners
+
+class LevelLoader:
+    def __init__(self, game, tile_size=16, merge_physics=False, cache_size=LEVEL_CACHE_SIZE):
+        self.game = game
+        self.tile_size = tile_size
+        self.merge_physics = merge_physics
+        self.cache_size = cache_size
+        self.listings = {}
+        self.pending = {}
+        self.cache = OrderedDict()
+        self.executor = ThreadPoolExecutor(max_workers=1)
+
+    def listing(self, path):
+        if path not in self.listings:
+            self.listings[path] = set(os.listdir(path))
+        return self.listings[path]
+
+    def level_count(self, path):
+        # each level has a JSON source and maybe a converted .map next to it
+        return len([name for name in self.listing(path) if name.endswith(".json")])
+
+    def map_path(self, path, map_id):
+        # converted binary maps load much faster, but the editor only writes JSON, so a .map not made from the current JSON is stale
+        json_path = str(path) + str(map_id) + ".json"
+        map_path = str(path) + str(map_id) + ".map"
+        if str(map_id) + ".map" not in self.listing(path):
+            return json_path
+        if str(map_id) + ".json" in self.listing(path) and map_source(map_path) != source_stamp(json_path):
+            return json_path
+        return map_path
+
+    def parse(self, path, map_id):
+        # runs on the worker: file reads and decoding only, since the tile lookups below need game.assets
+        return read_map(self.map_path(path, map_id))
+
+    def build(self, map_data, merge_physics):
+        tilemap = Tilemap(self.game, tile_size=self.tile_size, merge_physics=merge_physics)
+        tilemap.set_map(*map_data)
+
+        leaf_spawners = []
+        for tree in tilemap.extract([("large_decor", 1), ("large_decor", 4)], keep=True):
+            leaf_spawners.append((4 + tree["pos"][0], 4 + tree["pos"][1], 23, 13))
+        spawners = [(spawner["variant"], tuple(spawner["pos"])) for spawner in tilemap.extract([("spawners", 0), ("spawners", 1), ("spawners", 2)])]
+        return Level(tilemap, tuple(spawners), tuple(leaf_spawners))
+
+    def preload(self, path, map_id):
+        # read on the worker thread while the current level plays; the same data builds either merge_physics template
+        key = (path, map_id)
+        if key not in self.pending and key + (self.merge_physics,) not in self.cache:
+            self.pending[key] = self.executor.submit(self.parse, *key)
+
+    def load(self, path, map_id):
+        # merge_physics is part of the key, so toggling it never hands back a template built the other way
+        key = (path, map_id, self.merge_physics)
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            return self.cache[key]
+
+        future = self.pending.pop((path, map_id), None)
+        map_data = future.result() if future else self.parse(path, map_id)
+        self.cache[key] = self.build(map_data, self.merge_physics)
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return self.cache[key]
@@ -0,0 +1,79 @@
+import struct
+import hashlib
+
+MAP_MAGIC = b"DSMP"
+MAP_VERSION = 2
+# magic, version, tile size, palette size, tile run count, offgrid tile count, source JSON size and md5
+# (all zero when the map was not converted from a JSON)
+MAP_HEADER = struct.Struct("<4sBHBIII16s")
+NO_SOURCE = (0, bytes(16))
+# x, y, run length, palette index: one run covers consecutive tiles of the same type and variant in a row
+TILE_RUN = struct.Struct("<hhHB")
+# palette index, x, y
+OFFGRID_TILE = struct.Struct("<Bdd")
+
+def source_stamp(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    return len(data), hashlib.md5(data).digest()
+
+def map_source(path):
+    # only the header is read; mtimes don't survive a git checkout, so staleness is judged by content
+    with open(path, "rb") as f:
+        header = f.read(MAP_HEADER.size)
+    if len(header) < MAP_HEADER.size:
+        return None
+    magic, version = header[:4], header[4]
+    if magic != MAP_MAGIC or version != MAP_VERSION:
+        return None
+    return MAP_HEADER.unpack(header)[6:]
+
+def encode_map(tilemap, tile_size, offgrid_tiles, source=NO_SOURCE):
+    palette = {}
+    for tile in list(tilemap.values()) + offgrid_tiles:
+        palette.setdefault((tile["type"], tile["variant"]), len(palette))
+
+    runs = []
+    for loc in sorted(tilemap, key=lambda loc: (loc[1], loc[0])):
+        entry = palette[(tilemap[loc]["type"], tilemap[loc]["variant"])]
+        run = runs[-1] if runs else None
+        if run and run[1] == loc[1] and run[0] + run[2] == loc[0] and run[3] == entry:
+            run[2] += 1
+        else:
+            runs.append([loc[0], loc[1], 1, entry])
+
+    data = bytearray(MAP_HEADER.pack(MAP_MAGIC, MAP_VERSION, tile_size, len(palette), len(runs), len(offgrid_tiles), source[0], source[1]))
+    for t_type, variant in palette:
+        name = t_type.encode()
+        data += bytes([len(name)]) + name + bytes([variant])
+    for run in runs:
+        data += TILE_RUN.pack(*run)
+    for tile in offgrid_tiles:
+        data += OFFGRID_TILE.pack(palette[(tile["type"], tile["variant"])], tile["pos"][0], tile["pos"][1])
+    return bytes(data)
+
+def decode_map(data):
+    view = memoryview(data)
+    magic, version, tile_size, palette_size, run_count, offgrid_count = MAP_HEADER.unpack_from(view)[:6]
+    if magic != MAP_MAGIC or version != MAP_VERSION:
+        raise ValueError("not a version " + str(MAP_VERSION) + " map")
+
+    offset = MAP_HEADER.size
+    palette = []
+    for i in range(palette_size):
+        length = view[offset]
+        palette.append((bytes(view[offset + 1:offset + 1 + length]).decode(), view[offset + 1 + length]))
+        offset += length + 2
+
+    tilemap = {}
+    end = offset + run_count * TILE_RUN.size
+    for x, y, length, entry in TILE_RUN.iter_unpack(view[offset:end]):
+        t_type, variant = palette[entry]
+        for tile_x in range(x, x + length):
+            tilemap[(tile_x, y)] = {"type": t_type, "variant": variant, "pos": [tile_x, y]}
+
+    offgrid_tiles = []
+    for entry, x, y in OFFGRID_TILE.iter_unpack(view[end:end + offgrid_count * OFFGRID_TILE.size]):
+        offgrid_tiles.append({"type": palette[entry][0], "variant": palette[entry][1], "pos": [x, y]})
+
+    return tilemap, tile_size, offgrid_tiles
@@ -0,0 +1,108 @@
+import os
+import json
+import hashlib
+import pygame
+
+OUTLINE_COLOR = (0, 0, 0, 180)
+OUTLINE_OFFSETS = [(-1,0), (1,0), (0,-1), (0,1)]
+OUTLINE_CACHE_PATH = "data/cache/"
+ATLAS_WIDTH = 512
+
+def make_outline(img):
+    silhouette = pygame.mask.from_surface(img).to_surface(setcolor=OUTLINE_COLOR, unsetcolor=(0, 0, 0, 0))
+    outline = pygame.Surface((img.get_width() + 2, img.get_height() + 2), pygame.SRCALPHA)
+    for offset in OUTLINE_OFFSETS:
+        outline.blit(silhouette, (1 + offset[0], 1 + offset[1]))
+    return outline
+
+def file_hash(path):
+    with open(path, "rb") as f:
+        return hashlib.md5(f.read()).hexdigest()
+
+def sources_match(cached, sources):
+    # mtime is checked first so an untouched tree never hashes anything; returns (match, whether a stamp was refreshed)
+    if sorted(cached) != sorted(sources):
+        return False, False
+    refreshed = False
+    for path in sources:
+        mtime, digest = cached[path]
+        if mtime != os.path.getmtime(path):
+            if digest != file_hash(path):
+                return False, False
+            # touched but unchanged (a checkout, say): store the new mtime so the next start skips the hash
+            cached[path] = [os.path.getmtime(path), digest]
+            refreshed = True
+    return True, refreshed
+
+def derivation_key(images, params):
+    # sources only cover the PNGs; flips, rotations and their order are derived in code, so the caller describes them
+    return json.loads(json.dumps({"params": params, "count": len(images), "color": OUTLINE_COLOR, "offsets": OUTLINE_OFFSETS, "pygame": pygame.version.ver}))
+
+def pack_atlas(surfaces, width=ATLAS_WIDTH):
+    rects = []
+    x = y = row_height = 0
+    for surf in surfaces:
+        if x + surf.get_width() > width:
+            x = 0
+            y += row_height
+            row_height = 0
+        rects.append((x, y, surf.get_width(), surf.get_height()))
+        x += surf.get_width()
+        row_height = max(row_height, surf.get_height())
+
+    atlas = pygame.Surface((width, max(1, y + row_height)), pygame.SRCALPHA)
+    for surf, rect in zip(surfaces, rects):
+        atlas.blit(surf, rect[:2])
+    return atlas, rects
+
+def load_outline_atlas(name, images, sources, params, path=OUTLINE_CACHE_PATH):
+    atlas_path = path + name + ".png"
+    table_path = path + name + ".json"
+    derivation = derivation_key(images, params)
+
+    try:
+        with open(table_path, "r") as f:
+            table = json.load(f)
+        match, refreshed = sources_match(table["sources"], sources)
+        if match and table["derivation"] == derivation:
+            atlas = pygame.image.load(atlas_path).convert_alpha()
+            if refreshed:
+                with open(table_path, "w") as f:
+                    json.dump(table, f)
+            return [atlas.subsurface(rect) for rect in table["rects"]]
+    except (FileNotFoundError, ValueError, KeyError, pygame.error):
+        pass
+
+    atlas, rects = pack_atlas([make_outline(img) for img in images])
+    os.makedirs(path, exist_ok=True)
+    pygame.image.save(atlas, atlas_path)
+    with open(table_path, "w") as f:
+        json.dump({"sources": {source: [os.path.getmtime(source), file_hash(source)] for source in sources}, "derivation": derivation, "rects": rects}, f)
+    return [atlas.subsurface(rect) for rect in rects]
+
+class Outline:
+    def __init__(self, size):
+        self.layer = pygame.Surface(size, pygame.SRCALPHA)
+        self.cache = {}
+
+    def preload(self, name, images, sources, params):
+        for img, outline in zip(images, load_outline_atlas(name, images, sources, params)):
+            self.cache[img] = outline
+
+    def clear(self):
+        self.layer.fill((0, 0, 0, 0))
+
+    def get(self, img):
+        if img not in self.cache:
+            self.cache[img] = make_outline(img)
+        return self.cache[img]
+
+    def blit(self, img, pos):
+        self.layer.blit(self.get(img), (pos[0] - 1, pos[1] - 1))
+
+    def polygon(self, points):
+        for offset in OUTLINE_OFFSETS:
+            pygame.draw.polygon(self.layer, OUTLINE_COLOR, [(point[0] + offset[0], point[1] + offset[1]) for point in points])
+
+    def render(self, screen):
+        screen.blit(self.layer, (0, 0))
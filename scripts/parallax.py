@@ -0,0 +1,75 @@
+import pygame
+
+class ParallaxBand:
+    def __init__(self, items, depth, speed=0, period=None):
+        self.items = items
+        self.depth = depth
+        self.speed = speed
+        self.period = period
+        self.scroll = 0
+        self.size = None
+        self.tile = None
+
+    def bake(self, size):
+        self.size = size
+        margin = (max(img.get_width() for img, pos in self.items), max(img.get_height() for img, pos in self.items))
+        # without a fixed period, items wrap like the old clouds did: once off one edge they come back on the other
+        period = self.period or (size[0] + margin[0], size[1] + margin[1])
+        reps = (size[0] // period[0] + 2, size[1] // period[1] + 2)
+        self.margin = margin if not self.period else (0, 0)
+        self.wrap = period
+
+        self.tile = pygame.Surface((period[0] * reps[0], period[1] * reps[1]), pygame.SRCALPHA)
+        for img, pos in self.items:
+            for x in range(-1, reps[0]):
+                for y in range(-1, reps[1]):
+                    self.tile.blit(img, (pos[0] % period[0] + x * period[0], pos[1] % period[1] + y * period[1]))
+        self.tile.set_alpha(255, pygame.RLEACCEL)
+
+    def update(self):
+        self.scroll += self.speed
+
+    def render(self, screen, offset=(0,0)):
+        if screen.get_size() != self.size:
+            self.bake(screen.get_size())
+        x = int((self.margin[0] - self.scroll + offset[0] * self.depth) % self.wrap[0])
+        y = int((self.margin[1] + offset[1] * self.depth) % self.wrap[1])
+        screen.blit(self.tile, (0, 0), (x, y, self.size[0], self.size[1]))
+
+class ParallaxSprite:
+    # one item at its own depth and speed, wrapped on its own; cheaper than baking a screen-sized tile for it
+    def __init__(self, image, pos, depth, speed=0):
+        self.image = image
+        self.pos = list(pos)
+        self.depth = depth
+        self.speed = speed
+
+    def update(self):
+        self.pos[0] += self.speed
+
+    def render(self, screen, offset=(0,0)):
+        render_pos = (self.pos[0] - offset[0] * self.depth, self.pos[1] - offset[1] * self.depth)
+        screen.blit(self.image, (render_pos[0] % (screen.get_width() + self.image.get_width()) - self.image.get_width(), render_pos[1] % (screen.get_height() + self.image.get_height()) - self.image.get_height()))
+
+class Parallax:
+    def __init__(self):
+        self.bands = []
+
+    def add_band(self, items, depth, speed=0, period=None):
+        self.bands.append(ParallaxBand(items, depth, speed, period))
+        self.bands.sort(key=lambda band: band.depth)
+
+    def add_sprite(self, image, pos, depth, speed=0):
+        self.bands.append(ParallaxSprite(image, pos, depth, speed))
+        self.bands.sort(key=lambda band: band.depth)
+
+    def add_layer(self, image, depth, speed=0, pos=(0,0)):
+        self.add_band([(image, pos)], depth, speed, image.get_size())
+
+    def update(self):
+        for band in self.bands:
+            band.update()
+
+    def render(self, screen, offset=(0,0)):
+        for band in self.bands:
+            band.render(screen, offset)
@@ -1,26 +1,57 @@
-import pygame
+import math
 
-class Particle:
-    def __init__(self, game, p_type, pos, velocity=[0,0], frame=0):
+class ParticleSystem:
+    def __init__(self, game):
         self.game = game
-        self.type = p_type
-        self.pos = list(pos)
-        self.velocity = velocity
-        self.animation = self.game.assets["particles/" + p_type].copy()
-        self.animation.frame = frame
-    
+        self.clear()
+
+    def __len__(self):
+        return len(self.types)
+
+    def clear(self):
+        self.types = []
+        self.pos_x = []
+        self.pos_y = []
+        self.vel_x = []
+        self.vel_y = []
+        self.frames = []
+        self.drift = []
+        self.done = []
+
+    def spawn(self, p_type, pos, velocity=[0,0], frame=0):
+        self.types.append(p_type)
+        self.pos_x.append(pos[0])
+        self.pos_y.append(pos[1])
+        self.vel_x.append(velocity[0])
+        self.vel_y.append(velocity[1])
+        self.frames.append(frame)
+        self.drift.append(0)
+        self.done.append(False)
+
     def update(self):
-        kill = False
-        
-        self.pos[0] += self.velocity[0]
-        self.pos[1] += self.velocity[1]
+        if not self.types:
+            return
+
+        # the last step is finished only now that it has been drawn: leaves drift after rendering and
+        # finished particles still show their last frame once, as the old Particle update/render loop did
+        self.pos_x = [x + drift for x, drift in zip(self.pos_x, self.drift)]
+        if any(self.done):
+            alive = [not done for done in self.done]
+            self.types = [value for value, keep in zip(self.types, alive) if keep]
+            self.pos_x = [value for value, keep in zip(self.pos_x, alive) if keep]
+            self.pos_y = [value for value, keep in zip(self.pos_y, alive) if keep]
+            self.vel_x = [value for value, keep in zip(self.vel_x, alive) if keep]
+            self.vel_y = [value for value, keep in zip(self.vel_y, alive) if keep]
+            self.frames = [value for value, keep in zip(self.frames, alive) if keep]
 
-        self.animation.update()
-        if self.animation.done:
-            kill = True
+        last_frame = {p_type: self.game.assets["particles/" + p_type].last_frame for p_type in set(self.types)}
 
-        return kill
+        self.pos_x = [x + vx for x, vx in zip(self.pos_x, self.vel_x)]
+        self.pos_y = [y + vy for y, vy in zip(self.pos_y, self.vel_y)]
+        self.frames = [min(frame + 1, last_frame[p_type]) for frame, p_type in zip(self.frames, self.types)]
+        self.done = [frame >= last_frame[p_type] for frame, p_type in zip(self.frames, self.types)]
+        self.drift = [math.sin(frame * 0.035) * 0.3 if p_type == "leaf" else 0 for frame, p_type in zip(self.frames, self.types)]
 
     def render(self, screen, offset=(0,0)):
-        img = self.animation.img()
-        screen.blit(img, (self.pos[0] - offset[0], self.pos[1] - offset[1]))
\ No newline at end of file
+        frame_images = {p_type: self.game.assets["particles/" + p_type].frame_images for p_type in set(self.types)}
+        screen.blits([(frame_images[p_type][frame], (x - offset[0], y - offset[1])) for p_type, x, y, frame in zip(self.types, self.pos_x, self.pos_y, self.frames)], doreturn=False)
@@ -0,0 +1,22 @@
+class Pool:
+    def __init__(self, game, cls):
+        self.game = game
+        self.cls = cls
+        self.free = []
+        self.hits = 0
+        self.misses = 0
+
+    def acquire(self, *args):
+        if self.free:
+            self.hits += 1
+            obj = self.free.pop()
+            obj.reset(*args)
+            return obj
+        self.misses += 1
+        return self.cls(self.game, *args)
+
+    def release(self, obj):
+        self.free.append(obj)
+
+    def stats(self):
+        return f"{self.cls.__name__}: {self.hits} hits, {self.misses} misses, {len(self.free)} free"
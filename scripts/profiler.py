@@ -0,0 +1,86 @@
+import csv
+import json
+import time
+import pygame
+from collections import deque
+
+PROFILE_HISTORY = 240
+OVERLAY_REFRESH = 15
+
+class Profiler:
+    def __init__(self, enabled=False, history=PROFILE_HISTORY):
+        self.enabled = enabled
+        self.history = history
+        self.show = False
+        self.font = None
+        self.trace = None
+        self.reset()
+
+    def reset(self):
+        self.totals = {}
+        self.samples = {}
+        self.frame = {}
+        self.frames = 0
+        self.overlay = None
+        self.last = time.perf_counter()
+
+    def toggle_overlay(self):
+        self.show = not self.show
+        self.enabled = self.show
+        self.reset()
+
+    def lap(self, name):
+        # everything since the previous lap is charged to name
+        if self.enabled:
+            now = time.perf_counter()
+            self.frame[name] = self.frame.get(name, 0) + now - self.last
+            self.last = now
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        for name, elapsed in self.frame.items():
+            self.totals[name] = self.totals.get(name, 0) + elapsed
+            if name not in self.samples:
+                self.samples[name] = deque(maxlen=self.history)
+            self.samples[name].append(elapsed * 1000)
+        if self.trace is not None:
+            self.trace.append({name: elapsed * 1000 for name, elapsed in self.frame.items()})
+        self.frame = {}
+        self.frames += 1
+
+    def percentile(self, name, percent):
+        samples = sorted(self.samples[name])
+        return samples[min(len(samples) - 1, int(len(samples) * percent / 100))]
+
+    def report(self):
+        return {name: total / max(1, self.frames) * 1000 for name, total in self.totals.items()}
+
+    def render(self, screen, color="black"):
+        if not self.show:
+            return
+        if not self.font:
+            self.font = pygame.font.Font(None, 20)
+        # percentiles only change slowly, so the text is rebuilt every few frames
+        if not self.overlay or self.frames % OVERLAY_REFRESH == 0:
+            lines = ["phase  p50 / p95 / p99 ms"] + [f"{name}  {self.percentile(name, 50):.2f} / {self.percentile(name, 95):.2f} / {self.percentile(name, 99):.2f}" for name in sorted(self.samples)]
+            lines = [self.font.render(line, True, color) for line in lines]
+            self.overlay = pygame.Surface((max(line.get_width() for line in lines) + 12, len(lines) * 16 + 8), pygame.SRCALPHA)
+            self.overlay.fill((255, 255, 255, 170))
+            for i, line in enumerate(lines):
+                self.overlay.blit(line, (6, 4 + i * 16))
+        screen.blit(self.overlay, (screen.get_width() - self.overlay.get_width() - 10, 40))
+
+    def export(self, path):
+        names = []
+        for frame in self.trace or ():
+            names += [name for name in frame if name not in names]
+
+        with open(path, "w", newline="") as f:
+            if path.endswith(".json"):
+                json.dump({"phases": names, "frames": self.trace or []}, f)
+            else:
+                writer = csv.writer(f)
+                writer.writerow(["frame"] + names)
+                for i, frame in enumerate(self.trace or ()):
+                    writer.writerow([i] + [round(frame.get(name, 0), 4) for name in names])
@@ -1,41 +1,59 @@
-import pygame
 import random
 import math
-from scripts.particle import Particle
+from scripts.utils import pick_rotation
 
 class Projectile:
+    __slots__ = ("game", "pos", "velocity", "speed", "timer", "damage", "image")
+
     def __init__(self, game, pos, speed, velocity=[0,0], damage=1):
         self.game = game
-        self.pos = list(pos)
-        self.velocity = velocity
+        self.pos = [0, 0]
+        self.velocity = [0, 0]
+        self.image = self.game.assets["shiruken"]
+        Projectile.reset(self, pos, speed, velocity, damage)
+
+    def reset(self, pos, speed, velocity=[0,0], damage=1):
+        self.pos[0] = pos[0]
+        self.pos[1] = pos[1]
+        self.velocity[0] = velocity[0]
+        self.velocity[1] = velocity[1]
         self.speed = speed
         self.timer = 0
         self.damage = damage
-        self.image = self.game.assets["shiruken"]
     
     def update(self):
         self.pos[0] += self.velocity[0] * self.speed
         self.pos[1] += self.velocity[1] * self.speed
         self.timer += 1
 
-        if self.timer > 360:
+        if self.timer > 360 or not self.game.tilemap.bounds.collidepoint(self.pos):
             return True
     
-    def render(self, screen, offset=(0,0), details=True):
-        if details:
-            image_copy = pygame.transform.rotate(self.image, self.timer)
-            screen.blit(image_copy, (self.pos[0] - (image_copy.get_width() // 2) - offset[0], self.pos[1] - (image_copy.get_height() // 2) - offset[1]))
-        else:
-            screen.blit(self.image, (self.pos[0] - (self.image.get_width() // 2) - offset[0], self.pos[1] - (self.image.get_height() // 2) - offset[1]))
+    def render(self, screen, offset=(0,0), details=True, outline=None):
+        image = pick_rotation(self.game.assets["shiruken/rotations"], self.timer) if details else self.image
+        screen.blit(image, (self.pos[0] - (image.get_width() // 2) - offset[0], self.pos[1] - (image.get_height() // 2) - offset[1]))
+        if outline:
+            outline.blit(image, (self.pos[0] - (image.get_width() // 2) - offset[0], self.pos[1] - (image.get_height() // 2) - offset[1]))
 
 class Boss_projectile(Projectile):
+    __slots__ = ("angle", "version", "rotated")
+
     def __init__(self, game, pos, speed, version, angle, velocity=[0,0], damage=1):
         super().__init__(game, pos, speed, velocity, damage)
 
-        self.angle = angle
         self.image = self.game.assets["fireball"]
+        self.aim(version, angle)
+
+    def reset(self, pos, speed, version, angle, velocity=[0,0], damage=1):
+        super().reset(pos, speed, velocity, damage)
+        self.aim(version, angle)
+
+    def aim(self, version, angle):
+        self.angle = angle
         self.version = version % len(self.image)
+        self.rotated = pick_rotation(self.game.assets["fireball/rotations"][self.version], -(self.angle * 180 / math.pi) -180)
     
-    def render(self, screen, offset=(0,0), details=True):
-        image_copy = pygame.transform.rotate(self.image[self.version], -(self.angle * 180 / math.pi) -180)
-        screen.blit(image_copy, (self.pos[0] - (image_copy.get_width() // 2) - offset[0], self.pos[1] - (image_copy.get_height() // 2) - offset[1]))
\ No newline at end of file
+    def render(self, screen, offset=(0,0), details=True, outline=None):
+        screen.blit(self.rotated, (self.pos[0] - (self.rotated.get_width() // 2) - offset[0], self.pos[1] - (self.rotated.get_height() // 2) - offset[1]))
+        if outline:
+            outline.blit(self.rotated, (self.pos[0] - (self.rotated.get_width() // 2) - offset[0], self.pos[1] - (self.rotated.get_height() // 2) - offset[1]))
\ No newline at end of file
@@ -0,0 +1,20 @@
+import pygame
+
+class RenderTargets:
+    def __init__(self, screen):
+        self.screen = screen
+        self.layers = {}
+        self.upscaled = None
+
+    def layer(self, img, size):
+        # static layers are scaled once per size instead of once per frame
+        if (img, size) not in self.layers:
+            self.layers[(img, size)] = pygame.transform.scale(img, size)
+        return self.layers[(img, size)]
+
+    def present(self, surf, offset=(0,0)):
+        size = self.screen.get_size()
+        if self.upscaled is None or self.upscaled.get_size() != size:
+            self.upscaled = pygame.Surface(size, 0, surf)
+        pygame.transform.scale(surf, size, self.upscaled)
+        self.screen.blit(self.upscaled, offset)
@@ -1,26 +1,51 @@
 import pygame
 import math
 
-class Spark:
-    def __init__(self, pos, angle, speed):
-        self.pos = list(pos)
-        self.angle = angle
-        self.speed = speed
+class SparkField:
+    def __init__(self):
+        self.clear()
 
-    def update(self):
-        self.pos[0] += math.cos(self.angle) * self.speed
-        self.pos[1] += math.sin(self.angle) * self.speed
+    def __len__(self):
+        return len(self.speeds)
+
+    def clear(self):
+        self.pos_x = []
+        self.pos_y = []
+        self.dir_x = []
+        self.dir_y = []
+        self.speeds = []
 
-        self.speed = max(0, self.speed - 0.1)
+    def spawn(self, pos, angle, speed):
+        self.pos_x.append(pos[0])
+        self.pos_y.append(pos[1])
+        self.dir_x.append(math.cos(angle))
+        self.dir_y.append(math.sin(angle))
+        self.speeds.append(speed)
+
+    def update(self):
+        if not self.speeds:
+            return
 
-        return not self.speed
+        self.pos_x = [x + dx * speed for x, dx, speed in zip(self.pos_x, self.dir_x, self.speeds)]
+        self.pos_y = [y + dy * speed for y, dy, speed in zip(self.pos_y, self.dir_y, self.speeds)]
+        self.speeds = [max(0, speed - 0.1) for speed in self.speeds]
 
-    def render(self, screen, offset=(0,0)):
-        render_points = [
-            (self.pos[0] + math.cos(self.angle) * self.speed * 3 - offset[0], self.pos[1] + math.sin(self.angle) * self.speed * 3 - offset[1]),
-            (self.pos[0] + math.cos(self.angle + math.pi * 0.5) * self.speed * 3 - offset[0], self.pos[1] + math.sin(self.angle + math.pi * 0.5) * self.speed * 3 - offset[1]),
-            (self.pos[0] + math.cos(self.angle + math.pi) * self.speed * 3 - offset[0], self.pos[1] + math.sin(self.angle + math.pi) * self.speed * 3 - offset[1]),
-            (self.pos[0] + math.cos(self.angle - math.pi * 0.5) * self.speed * 3 - offset[0], self.pos[1] + math.sin(self.angle - math.pi * 0.5) * self.speed * 3 - offset[1]),
-        ]
+        if not all(self.speeds):
+            alive = [speed > 0 for speed in self.speeds]
+            self.pos_x = [value for value, keep in zip(self.pos_x, alive) if keep]
+            self.pos_y = [value for value, keep in zip(self.pos_y, alive) if keep]
+            self.dir_x = [value for value, keep in zip(self.dir_x, alive) if keep]
+            self.dir_y = [value for value, keep in zip(self.dir_y, alive) if keep]
+            self.speeds = [value for value, keep in zip(self.speeds, alive) if keep]
 
-        pygame.draw.polygon(screen, (255, 255, 255), render_points)
\ No newline at end of file
+    def render(self, screen, offset=(0,0), outline=None):
+        draw_polygon = pygame.draw.polygon
+        for x, y, dx, dy, speed in zip(self.pos_x, self.pos_y, self.dir_x, self.dir_y, self.speeds):
+            x -= offset[0]
+            y -= offset[1]
+            dx *= speed * 3
+            dy *= speed * 3
+            points = ((x + dx, y + dy), (x - dy, y + dx), (x - dx, y - dy), (x + dy, y - dx))
+            draw_polygon(screen, (255, 255, 255), points)
+            if outline:
+                outline.polygon(points)
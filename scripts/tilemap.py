@@ -1,5 +1,8 @@
 import pygame
 import json
+import math
+from scripts.outline import make_outline
+from scripts.mapformat import encode_map, decode_map
 
 AUTOTILE_MAP = {
     tuple(sorted([(1,0), (0,1)])): 0,
@@ -15,61 +18,163 @@ AUTOTILE_MAP = {
 
 NEIGHBOUR_OFFSETS = [
     (-1, 0), (-1, -1), (0, -1), (1, -1), (1, 0), (0, 0), (-1, 1), (0, 1), (1, 1), 
-    (-2, 0), (-2, -2), (0, -2), (2, -2), (2, 0), (0, 0), (-2, 2), (0, 2), (2, 2), 
-    (-2, 1), (-2, -2), (1, -2), (2, -2), (2, 1), (1, 1), (-2, 2), (1, 2), (2, 2), 
+    (-2, 0), (-2, -2), (0, -2), (2, -2), (2, 0), (-2, 2), (0, 2), (2, 2), 
+    (-2, 1), (1, -2), (2, 1), (1, 2), 
     ]
 PHYSICS_TILES = {"grass", "stone"}
 AUTOTILE_TYPE = {"grass", "stone"}
+CHUNK_SIZE = 16
+# ongrid images (large_decor) can hang up to this many tiles past their own cell; offgrid tiles are indexed per covered cell
+CHUNK_MARGIN = 2
+# projectiles further than this many tiles outside the map are culled
+BOUNDS_MARGIN = 16
+
+def loc_from_key(key):
+    x, y = key.split(";")
+    return (int(x), int(y))
+
+def key_from_loc(loc):
+    return str(loc[0]) + ";" + str(loc[1])
+
+def read_map(path):
+    # plain data only, so it is safe off the main thread
+    if path.endswith(".map"):
+        f = open(path, "rb")
+        tilemap, tile_size, offgrid_tiles = decode_map(f.read())
+        f.close()
+        return tilemap, tile_size, offgrid_tiles
+
+    f = open(path, "r")
+    map_data = json.load(f)
+    f.close()
+    return {loc_from_key(key): tile for key, tile in map_data["tilemap"].items()}, map_data["tile_size"], map_data["offgrid"]
 
 class Tilemap:
-    def __init__(self, game, tile_size=16):
+    def __init__(self, game, tile_size=16, merge_physics=False):
         self.game = game
         self.tile_size = tile_size
+        self.merge_physics = merge_physics
         self.tilemap = {}
+        self.physics_rects = {}
+        self.bounds = pygame.Rect(0, 0, 0, 0)
         self.offgrid_tiles = []
+        self.offgrid_index = {}
+        self.offgrid_serial = 0
+        self.chunks = {}
+        self.outline_chunks = {}
 
     def tiles_around(self, pos):
         tiles = []
         tile_loc = (int(pos[0] // self.tile_size), int(pos[1] // self.tile_size))
         for offset in NEIGHBOUR_OFFSETS:
-            check_loc = str(tile_loc[0] + offset[0]) + ";" + str(tile_loc[1] + offset[1])
+            check_loc = (tile_loc[0] + offset[0], tile_loc[1] + offset[1])
             if check_loc in self.tilemap:
                 tiles.append(self.tilemap[check_loc])
         return tiles
 
-    def physics_rects_around(self, pos):
+    def index_physics(self):
+        self.physics_rects = {}
+        if self.merge_physics:
+            return self.index_merged_physics()
+        for loc in self.tilemap:
+            if self.tilemap[loc]["type"] in PHYSICS_TILES:
+                self.physics_rects[loc] = pygame.Rect(loc[0] * self.tile_size, loc[1] * self.tile_size, self.tile_size, self.tile_size)
+
+    def index_merged_physics(self):
+        rows = {}
+        for loc in sorted(self.tilemap, key=lambda loc: (loc[1], loc[0])):
+            if self.tilemap[loc]["type"] in PHYSICS_TILES:
+                rows.setdefault(loc[1], []).append(loc[0])
+
+        merged = []
+        open_rects = {}
+        for y in sorted(rows):
+            runs = []
+            for x in rows[y]:
+                if runs and runs[-1][1] == x - 1:
+                    runs[-1][1] = x
+                else:
+                    runs.append([x, x])
+
+            still_open = {}
+            for run in runs:
+                run = tuple(run)
+                if run in open_rects and open_rects[run][3] == y - 1:
+                    open_rects[run][3] = y
+                    still_open[run] = open_rects[run]
+                else:
+                    still_open[run] = [run[0], y, run[1], y]
+                    merged.append(still_open[run])
+            open_rects = still_open
+
+        for x0, y0, x1, y1 in merged:
+            rect = pygame.Rect(x0 * self.tile_size, y0 * self.tile_size, (x1 - x0 + 1) * self.tile_size, (y1 - y0 + 1) * self.tile_size)
+            for x in range(x0, x1 + 1):
+                for y in range(y0, y1 + 1):
+                    self.physics_rects[(x, y)] = rect
+
+    def index_bounds(self):
+        if not self.tilemap:
+            self.bounds = pygame.Rect(0, 0, 0, 0)
+            return
+        xs = [loc[0] for loc in self.tilemap]
+        ys = [loc[1] for loc in self.tilemap]
+        self.bounds = pygame.Rect((min(xs) - BOUNDS_MARGIN) * self.tile_size, (min(ys) - BOUNDS_MARGIN) * self.tile_size, (max(xs) - min(xs) + 1 + BOUNDS_MARGIN * 2) * self.tile_size, (max(ys) - min(ys) + 1 + BOUNDS_MARGIN * 2) * self.tile_size)
+
+    def physics_rects_around(self, rect):
         rects = []
-        for tile in self.tiles_around(pos):
-            if tile["type"] in PHYSICS_TILES:
-                rects.append(pygame.Rect(tile["pos"][0] * self.tile_size, tile["pos"][1] * self.tile_size, self.tile_size, self.tile_size))
+        # only merged cells share a rect; per-tile rects are unique, so they skip the dedupe
+        seen = set() if self.merge_physics else None
+        for x in range(rect.left // self.tile_size, (rect.right - 1) // self.tile_size + 1):
+            for y in range(rect.top // self.tile_size, (rect.bottom - 1) // self.tile_size + 1):
+                if (x, y) in self.physics_rects:
+                    physics_rect = self.physics_rects[(x, y)]
+                    if seen is not None:
+                        if id(physics_rect) in seen:
+                            continue
+                        seen.add(id(physics_rect))
+                    rects.append(physics_rect)
         return rects
     
     def save_map(self, path):
+        if path.endswith(".map"):
+            f = open(path, "wb")
+            f.write(encode_map(self.tilemap, self.tile_size, self.offgrid_tiles))
+            f.close()
+            return
+
         f = open(path, "w")
-        json.dump({"tilemap": self.tilemap, "tile_size": self.tile_size, "offgrid": self.offgrid_tiles}, f)
+        json.dump({"tilemap": {key_from_loc(loc): tile for loc, tile in self.tilemap.items()}, "tile_size": self.tile_size, "offgrid": self.offgrid_tiles}, f)
         f.close()
 
     def load_map(self, path):
-        f = open(path, "r")
-        map_data = json.load(f)
-        f.close()
+        self.set_map(*read_map(path))
 
-        self.tilemap = map_data["tilemap"]
-        self.tile_size = map_data["tile_size"]
-        self.offgrid_tiles = map_data["offgrid"]
+    def set_map(self, tilemap, tile_size, offgrid_tiles):
+        self.tilemap = tilemap
+        self.tile_size = tile_size
+        self.offgrid_tiles = offgrid_tiles
+        self.index_physics()
+        self.index_bounds()
+        # built on first use, since filing a tile needs its image size
+        self.offgrid_index = None
+        self.chunks = {}
+        self.outline_chunks = {}
     
     def autotile(self):
         for loc in self.tilemap:
             tile = self.tilemap[loc]
             neighbours = set()
             for shift in [(1,0), (-1,0), (0,-1), (0,1)]:
-                check_loc = str(tile["pos"][0] + shift[0]) + ";" + str(tile["pos"][1] + shift[1])
+                check_loc = (loc[0] + shift[0], loc[1] + shift[1])
                 if check_loc in self.tilemap:
                     if self.tilemap[check_loc]["type"] == tile["type"]:
                         neighbours.add(shift)
             neighbours = tuple(sorted(neighbours))
             if (tile["type"] in AUTOTILE_TYPE) and (neighbours in AUTOTILE_MAP):
                 tile["variant"] = AUTOTILE_MAP[neighbours]
+        self.chunks = {}
+        self.outline_chunks = {}
 
     def extract(self, id_pairs, keep=False):
         matches = []
@@ -77,9 +182,9 @@ class Tilemap:
             if (tile["type"], tile["variant"]) in id_pairs:
                 matches.append(tile.copy())
                 if not keep:
-                    self.offgrid_tiles.remove(tile)
+                    self.remove_offgrid(tile)
 
-        for loc in self.tilemap:
+        for loc in list(self.tilemap):
             tile = self.tilemap[loc]
             if (tile["type"], tile["variant"]) in id_pairs:
                 matches.append(tile.copy()) 
@@ -87,12 +192,12 @@ class Tilemap:
                 matches[-1]["pos"][0] *= self.tile_size
                 matches[-1]["pos"][1] *= self.tile_size
                 if not keep:
-                    del self.tilemap[loc]
+                    self.remove_tile(loc)
         
         return matches
     
     def solid_check(self, pos, ai=True, t_type=None):
-        tile_loc = str(int(pos[0] // self.tile_size)) + ";" + str(int(pos[1] // self.tile_size))
+        tile_loc = (int(pos[0] // self.tile_size), int(pos[1] // self.tile_size))
         if tile_loc in self.tilemap:
             if ai:
                 if self.tilemap[tile_loc]["type"] in PHYSICS_TILES:
@@ -102,19 +207,124 @@ class Tilemap:
                     return self.tilemap[tile_loc]
     
     def check_grass(self, pos):
-        tile_loc = str(int(pos[0] // self.tile_size)) + ";" + str(int(pos[1] // self.tile_size))
+        tile_loc = (int(pos[0] // self.tile_size), int(pos[1] // self.tile_size))
         if tile_loc in self.tilemap:
             if self.tilemap[tile_loc]["type"] == "grass":
                 return self.tilemap[tile_loc]
                 
         
-    def render(self, screen, offset=(0,0)):
+    def tile_rect(self, tile, ongrid=True):
+        img = self.game.assets[tile["type"]][tile["variant"]]
+        if ongrid:
+            return pygame.Rect(tile["pos"][0] * self.tile_size, tile["pos"][1] * self.tile_size, img.get_width(), img.get_height())
+        return pygame.Rect(math.floor(tile["pos"][0]), math.floor(tile["pos"][1]), img.get_width(), img.get_height())
+
+    def invalidate(self, rect):
+        chunk_px = CHUNK_SIZE * self.tile_size
+        for x in range(rect.left // chunk_px, (rect.right - 1) // chunk_px + 1):
+            for y in range(rect.top // chunk_px, (rect.bottom - 1) // chunk_px + 1):
+                self.chunks.pop((x, y), None)
+                self.outline_chunks.pop((x, y), None)
+
+    def place_tile(self, tile_pos, t_type, variant):
+        self.remove_tile(tile_pos)
+        self.tilemap[tile_pos] = {"type": t_type, "variant": variant, "pos": list(tile_pos)}
+        if self.merge_physics:
+            self.index_physics()
+        elif t_type in PHYSICS_TILES:
+            self.physics_rects[tile_pos] = pygame.Rect(tile_pos[0] * self.tile_size, tile_pos[1] * self.tile_size, self.tile_size, self.tile_size)
+        self.invalidate(self.tile_rect(self.tilemap[tile_pos]))
+
+    def remove_tile(self, tile_pos):
+        if tile_pos in self.tilemap:
+            self.invalidate(self.tile_rect(self.tilemap[tile_pos]))
+            del self.tilemap[tile_pos]
+            if self.merge_physics:
+                self.index_physics()
+            else:
+                self.physics_rects.pop(tile_pos, None)
+
+    def offgrid_cells(self, tile):
+        # every cell the image covers, so lookups never depend on how far a tile hangs
+        rect = self.tile_rect(tile, ongrid=False)
+        cells = []
+        for x in range(rect.left // self.tile_size, (rect.right - 1) // self.tile_size + 1):
+            for y in range(rect.top // self.tile_size, (rect.bottom - 1) // self.tile_size + 1):
+                cells.append((x, y))
+        return cells
+
+    def index_offgrid(self):
+        self.offgrid_index = {}
+        self.offgrid_serial = 0
         for tile in self.offgrid_tiles:
-            screen.blit(self.game.assets[tile["type"]][tile["variant"]], (tile["pos"][0] - offset[0], tile["pos"][1] - offset[1]))
-            
-        for x in range(offset[0] // self.tile_size, (offset[0] + screen.get_width()) // self.tile_size + 1):
-            for y in range(offset[1] // self.tile_size, (offset[1] + screen.get_height()) // self.tile_size + 1):
-                loc = str(x) + ";" + str(y)
-                if loc in self.tilemap:
-                    tile = self.tilemap[loc]
-                    screen.blit(self.game.assets[tile["type"]][tile["variant"]], (tile["pos"][0] * self.tile_size - offset[0], tile["pos"][1] * self.tile_size - offset[1]))
\ No newline at end of file
+            self.add_offgrid_index(tile)
+
+    def add_offgrid_index(self, tile):
+        if self.offgrid_index is None:
+            return
+        for cell in self.offgrid_cells(tile):
+            self.offgrid_index.setdefault(cell, []).append((self.offgrid_serial, tile))
+        self.offgrid_serial += 1
+
+    def offgrid_tiles_in(self, rect):
+        if self.offgrid_index is None:
+            self.index_offgrid()
+        matches = {}
+        for x in range(rect.left // self.tile_size, (rect.right - 1) // self.tile_size + 1):
+            for y in range(rect.top // self.tile_size, (rect.bottom - 1) // self.tile_size + 1):
+                if (x, y) in self.offgrid_index:
+                    for serial, tile in self.offgrid_index[(x, y)]:
+                        if rect.colliderect(self.tile_rect(tile, ongrid=False)):
+                            matches[serial] = tile
+        return [matches[serial] for serial in sorted(matches)]
+
+    def place_offgrid(self, pos, t_type, variant):
+        self.offgrid_tiles.append({"type": t_type, "variant": variant, "pos": pos})
+        self.add_offgrid_index(self.offgrid_tiles[-1])
+        self.invalidate(self.tile_rect(self.offgrid_tiles[-1], ongrid=False))
+
+    def remove_offgrid(self, tile):
+        self.invalidate(self.tile_rect(tile, ongrid=False))
+        if self.offgrid_index is not None:
+            for cell in self.offgrid_cells(tile):
+                bucket = self.offgrid_index[cell]
+                for entry in bucket:
+                    if entry[1] is tile:
+                        bucket.remove(entry)
+                        break
+        self.offgrid_tiles.remove(tile)
+
+    def bake_chunk(self, chunk_loc):
+        chunk_px = CHUNK_SIZE * self.tile_size
+        chunk_rect = pygame.Rect(chunk_loc[0] * chunk_px, chunk_loc[1] * chunk_px, chunk_px, chunk_px)
+        chunk_surf = pygame.Surface(chunk_rect.size, pygame.SRCALPHA)
+        empty = True
+
+        for tile in self.offgrid_tiles_in(chunk_rect):
+            tile_r = self.tile_rect(tile, ongrid=False)
+            chunk_surf.blit(self.game.assets[tile["type"]][tile["variant"]], (tile_r.x - chunk_rect.x, tile_r.y - chunk_rect.y))
+            empty = False
+
+        for x in range(chunk_loc[0] * CHUNK_SIZE - CHUNK_MARGIN, (chunk_loc[0] + 1) * CHUNK_SIZE):
+            for y in range(chunk_loc[1] * CHUNK_SIZE - CHUNK_MARGIN, (chunk_loc[1] + 1) * CHUNK_SIZE):
+                if (x, y) in self.tilemap:
+                    tile = self.tilemap[(x, y)]
+                    chunk_surf.blit(self.game.assets[tile["type"]][tile["variant"]], (x * self.tile_size - chunk_rect.x, y * self.tile_size - chunk_rect.y))
+                    empty = False
+
+        if not empty:
+            chunk_surf.set_alpha(255, pygame.RLEACCEL)
+        self.chunks[chunk_loc] = None if empty else chunk_surf
+
+    def render(self, screen, offset=(0,0), outline=None):
+        chunk_px = CHUNK_SIZE * self.tile_size
+        for x in range(offset[0] // chunk_px, (offset[0] + screen.get_width()) // chunk_px + 1):
+            for y in range(offset[1] // chunk_px, (offset[1] + screen.get_height()) // chunk_px + 1):
+                if (x, y) not in self.chunks:
+                    self.bake_chunk((x, y))
+                if self.chunks[(x, y)]:
+                    screen.blit(self.chunks[(x, y)], (x * chunk_px - offset[0], y * chunk_px - offset[1]))
+                    if outline:
+                        if (x, y) not in self.outline_chunks:
+                            self.outline_chunks[(x, y)] = make_outline(self.chunks[(x, y)])
+                        outline.layer.blit(self.outline_chunks[(x, y)], (x * chunk_px - offset[0] - 1, y * chunk_px - offset[1] - 1))
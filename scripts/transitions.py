@@ -0,0 +1,21 @@
+import pygame
+
+TRANSITION_FRAMES = 30
+
+def iris(size, step):
+    surf = pygame.Surface(size)
+    pygame.draw.circle(surf, (255, 255, 255), (size[0] // 2, size[1] // 2), (TRANSITION_FRAMES - step) * 8)
+    surf.set_colorkey((255, 255, 255), pygame.RLEACCEL)
+    return surf
+
+TRANSITION_STYLES = {
+    "iris": iris,
+}
+
+class Transition:
+    def __init__(self, size, style="iris"):
+        self.frames = [TRANSITION_STYLES[style](size, step) for step in range(TRANSITION_FRAMES + 1)]
+
+    def render(self, screen, transition):
+        if transition:
+            screen.blit(self.frames[abs(transition)], (0, 0))
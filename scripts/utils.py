@@ -21,6 +21,24 @@ def load_images(path, alpha, flip=False):
             images.append(load_image(path + "/" + img_name, "n" if not flip else pygame.transform.flip(load_image(path + "/" + img_name, "n"), True, False)))
     return images
 
+def image_paths(*paths):
+    sources = []
+    for path in paths:
+        if os.path.isfile(ORIGINAL_IMG_PATH + path):
+            sources.append(ORIGINAL_IMG_PATH + path)
+            continue
+        for root, dirs, files in sorted(os.walk(ORIGINAL_IMG_PATH + path)):
+            sources += [root + "/" + img_name for img_name in sorted(files) if img_name.endswith(".png")]
+    return sources
+
+ROTATION_STEPS = 360
+
+def make_rotations(img, steps=ROTATION_STEPS):
+    return [pygame.transform.rotate(img, i * 360 / steps) for i in range(steps)]
+
+def pick_rotation(rotations, angle):
+    return rotations[round(angle * len(rotations) / 360) % len(rotations)]
+
 def current_fps(tick, font, screen, color, show=True):
     fps = int(tick.get_fps())
     fps_text = font.render(f"FPS:{fps}", True, color)
@@ -29,25 +47,40 @@ def current_fps(tick, font, screen, color, show=True):
 
 class Animation:
     def __init__(self, images, fps, loop=True):
-        self.images = images
+        self.images = tuple(images)
+        self.flipped = tuple(pygame.transform.flip(img, True, False) for img in images)
         self.fps = fps
         self.loop = loop
-        self.done = False
+        self.length = fps * len(self.images)
+        self.last_frame = self.length - 1
+        # image per tick, so playback never divides
+        self.frame_images = tuple(self.images[frame // fps] for frame in range(self.length))
+        self.frame_flipped = tuple(self.flipped[frame // fps] for frame in range(self.length))
+
+    def play(self):
+        return AnimationCursor(self)
+
+class AnimationCursor:
+    __slots__ = ("clip", "frame", "done")
+
+    def __init__(self, clip):
+        self.restart(clip)
+
+    def restart(self, clip):
+        self.clip = clip
         self.frame = 0
-    
-    def copy(self):
-        return Animation(self.images, self.fps, self.loop)
-    
-    def img(self):
-        return self.images[int(self.frame / self.fps)]
+        self.done = False
+
+    def img(self, flip=False):
+        return (self.clip.frame_flipped if flip else self.clip.frame_images)[self.frame]
 
     def update(self):
-        if self.loop:
-            self.frame = (self.frame + 1) % (self.fps * len(self.images))
+        if self.clip.loop:
+            self.frame = (self.frame + 1) % self.clip.length
         else:
-            self.frame = min(self.frame + 1, self.fps * len(self.images) - 1)
+            self.frame = min(self.frame + 1, self.clip.last_frame)
             
-            if self.frame >= self.fps * len(self.images) - 1:
+            if self.frame >= self.clip.last_frame:
                 self.done = True
 
 def load_sound(path, volume):